@@ -0,0 +1,174 @@
+import time
+
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbour index over TF-IDF rows
+
+    Rows are reduced with a fixed Gaussian random projection to dim dense
+    dimensions and clustered with spherical k-means into n_lists lists.
+    A query only visits the n_probe lists whose centroids are closest to
+    it; the caller scores those candidates exactly. n_probe is the
+    recall/latency knob: n_probe == n_lists is an exhaustive search.
+    """
+    # k-means is trained on at most this many rows per list
+    TRAIN_ROWS_PER_LIST = 256
+    ASSIGN_BLOCK_SIZE = 4096
+
+    # Fitted state, stored as arrays in the model artifact
+    ARRAYS = ('projection', 'centroids', 'assignments', 'list_ids', 'list_offsets')
+
+    def __init__(self, n_lists=None, n_probe=8, dim=64, n_iter=10, random_state=42):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.dim = dim
+        self.n_iter = n_iter
+        self.random_state = random_state
+        self.projection = None
+        self.centroids = None
+        self.assignments = None
+        self.list_ids = None
+        self.list_offsets = None
+
+    def get_params(self):
+        """
+        Constructor arguments, for storing alongside the fitted arrays
+        """
+        return {
+            'n_lists': self.n_lists,
+            'n_probe': self.n_probe,
+            'dim': self.dim,
+            'n_iter': self.n_iter,
+            'random_state': self.random_state
+        }
+
+    def _project(self, matrix):
+        """
+        Random-project sparse rows to L2-normalised dense float32 vectors
+        """
+        vectors = matrix @ self.projection
+        return normalize(np.asarray(vectors, dtype=np.float32))
+
+    def _assign(self, vectors):
+        """
+        Index of the closest centroid for every vector, computed in blocks
+        """
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), self.ASSIGN_BLOCK_SIZE):
+            block = vectors[start:start + self.ASSIGN_BLOCK_SIZE] @ self.centroids.T
+            assignments[start:start + self.ASSIGN_BLOCK_SIZE] = block.argmax(axis=1)
+        return assignments
+
+    def _set_lists(self, assignments):
+        """
+        Group row ids by list: list i holds list_ids[list_offsets[i]:list_offsets[i + 1]]
+        """
+        self.assignments = assignments
+        self.list_ids = np.argsort(assignments, kind='stable').astype(np.int32)
+        counts = np.bincount(assignments, minlength=len(self.centroids))
+        self.list_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+    def fit(self, matrix):
+        """
+        Build the index over the rows of a sparse matrix
+        """
+        rng = np.random.default_rng(self.random_state)
+        n_rows = matrix.shape[0]
+        n_lists = self.n_lists or int(np.sqrt(n_rows))
+        n_lists = min(max(n_lists, 1), n_rows)
+
+        self.projection = (
+            rng.standard_normal((matrix.shape[1], self.dim)) / np.sqrt(self.dim)
+        ).astype(np.float32)
+        vectors = self._project(matrix)
+
+        # Spherical k-means on a sample, then assign every row
+        sample_size = min(n_rows, n_lists * self.TRAIN_ROWS_PER_LIST)
+        sample = vectors[rng.choice(n_rows, sample_size, replace=False)]
+        self.centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+        for _ in range(self.n_iter):
+            labels = self._assign(sample)
+            membership = sparse.csr_matrix(
+                (np.ones(sample_size, dtype=np.float32), (labels, np.arange(sample_size))),
+                shape=(n_lists, sample_size)
+            )
+            sums = np.asarray(membership @ sample)
+
+            # Empty lists keep their previous centroid
+            filled = np.asarray(membership.sum(axis=1)).ravel() > 0
+            self.centroids[filled] = normalize(sums[filled])
+
+        self._set_lists(self._assign(vectors))
+        return self
+
+    def add(self, matrix):
+        """
+        Append new rows to the lists of their closest existing centroids
+        """
+        new_assignments = self._assign(self._project(matrix))
+        self._set_lists(np.concatenate([self.assignments, new_assignments]))
+
+    def remove(self, keep):
+        """
+        Drop rows where the boolean mask keep is False; later row ids shift down
+        """
+        self._set_lists(np.asarray(self.assignments)[keep])
+
+    def candidates(self, query_vector, n_probe=None):
+        """
+        Row ids in the n_probe lists closest to a 1 x F query vector
+        """
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        centroid_scores = self.centroids @ self._project(query_vector).ravel()
+        if n_probe < len(centroid_scores):
+            probe = np.argpartition(centroid_scores, len(centroid_scores) - n_probe)[-n_probe:]
+        else:
+            probe = np.arange(len(centroid_scores))
+        return np.concatenate([
+            self.list_ids[self.list_offsets[i]:self.list_offsets[i + 1]] for i in probe
+        ])
+
+def measure_recall(index, matrix, k=10, n_queries=200, n_probe=None, random_state=0):
+    """
+    Recall@k of the index against exact scoring, using catalog rows as queries
+
+    Returns (recall, exact_ms, ann_ms), the latencies being the mean time
+    per query for candidate generation plus scoring.
+    """
+    rng = np.random.default_rng(random_state)
+    queries = rng.choice(matrix.shape[0], min(n_queries, matrix.shape[0]), replace=False)
+
+    found = 0
+    expected = 0
+    exact_time = 0.0
+    ann_time = 0.0
+    for movie_idx in queries:
+        query_vector = matrix[movie_idx]
+
+        start = time.perf_counter()
+        scores = (matrix @ query_vector.T).toarray().ravel()
+        scores[movie_idx] = -np.inf
+        kk = min(k, len(scores) - 1)
+        exact = np.argpartition(scores, len(scores) - kk)[-kk:]
+        exact_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        candidates = index.candidates(query_vector, n_probe)
+        candidates = candidates[candidates != movie_idx]
+        scores = (matrix[candidates] @ query_vector.T).toarray().ravel()
+        kk_ann = min(kk, len(candidates))
+        if kk_ann:
+            candidates = candidates[np.argpartition(scores, len(scores) - kk_ann)[-kk_ann:]]
+        ann_time += time.perf_counter() - start
+
+        found += len(np.intersect1d(exact, candidates))
+        expected += kk
+
+    return (
+        found / max(expected, 1),
+        exact_time / len(queries) * 1000,
+        ann_time / len(queries) * 1000
+    )
@@ -1,23 +1,57 @@
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# TMDB API Configuration
-TMDB_API_KEY = os.getenv('TMDB_API_KEY', 'your_api_key_here')
-TMDB_BASE_URL = 'https://api.themoviedb.org/3'
-TMDB_IMAGE_BASE_URL = 'https://image.tmdb.org/t/p/w500'
-
-# App Configuration
-APP_TITLE = "🎬 Movie Recommendation System"
-APP_ICON = "🎬"
-APP_LAYOUT = "wide"
-
-# Model Configuration
-MODEL_FILE = 'model.pkl'
-SAMPLE_DATA_FILE = 'sample_movies.csv'
-
-# UI Configuration
-DEFAULT_RECOMMENDATIONS = 5
-MAX_RECOMMENDATIONS = 10
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# TMDB API Configuration
+TMDB_API_KEY = os.getenv('TMDB_API_KEY', 'your_api_key_here')
+TMDB_BASE_URL = os.getenv('TMDB_BASE_URL', 'https://api.themoviedb.org/3')
+TMDB_IMAGE_BASE_URL = 'https://image.tmdb.org/t/p/w500'
+TMDB_CACHE_FILE = 'cache/tmdb.sqlite'  # persistent TMDB response cache shared by app processes
+TMDB_CACHE_TTLS = {  # seconds each kind of TMDB response is cached
+    'search': 7 * 24 * 3600,
+    'movie': 7 * 24 * 3600,  # details with appended videos
+    'trending': 3600
+}
+TMDB_NEGATIVE_TTL = 24 * 3600  # seconds a "not found" answer is cached
+TMDB_ENRICHMENT_FILE = 'cache/tmdb_enrichment.sqlite'  # TMDB metadata fetched offline for catalog titles
+TMDB_ENRICHMENT_BATCH = 200  # titles fetched between enrichment checkpoints
+TMDB_FETCH_WORKERS = 8  # concurrent TMDB requests when fetching a list of movies
+TMDB_TIMEOUT = (3.05, 10)  # connect and read timeouts in seconds for each TMDB request
+TMDB_MAX_RETRIES = 3  # retries of a TMDB request after a server error, 429 or failed connection
+TMDB_BACKOFF = 0.5  # seconds; retry n waits a random time up to TMDB_BACKOFF * 2**n
+TMDB_MAX_RETRY_WAIT = 10  # seconds; give up instead of honouring a longer Retry-After
+TMDB_RATE_LIMIT = 40  # TMDB requests per second allowed by the client-side limiter
+TMDB_RATE_BURST = 20  # requests the limiter lets through at once before throttling
+
+# App Configuration
+APP_TITLE = "🎬 Movie Recommendation System"
+APP_ICON = "🎬"
+APP_LAYOUT = "wide"
+
+# Model Configuration
+MODEL_DIR = 'model'  # memory-mapped model artifact written by train_model
+MODEL_FILE = 'model.pkl'  # legacy single-pickle model, still loadable
+MODEL_RELOAD_INTERVAL = 30  # seconds between checks for a new model version; 0 disables
+RESULT_CACHE_SIZE = 1024  # recommendation results kept in memory per process
+RESULT_CACHE_TTL = 3600  # seconds a cached recommendation result stays valid
+RESULT_CACHE_FILE = None  # optional SQLite file, e.g. 'cache/results.sqlite', to keep results across restarts
+SAMPLE_DATA_FILE = 'sample_movies.csv'
+CSV_CHUNK_SIZE = 50000  # movie CSV rows read and cleaned at a time
+NEIGHBOR_TOP_K = 10  # width of the precomputed neighbor table, >= MAX_RECOMMENDATIONS
+SIMILARITY_BLOCK_SIZE = 256  # rows scored at a time when building neighbors
+ANN_N_LISTS = None  # IVF lists; None picks sqrt(number of movies)
+ANN_N_PROBE = 8  # IVF lists visited per query: higher = better recall, slower
+EMBEDDING_DIM = 128  # dense SVD embedding size when embeddings are built
+HASH_N_FEATURES = 2 ** 18  # hash buckets for the vocabulary-free 'hashing' feature mode
+FEATURE_SAMPLE_SIZE = 5000  # movies used to compare hashed features with TF-IDF at train time
+REFIT_CHANGE_FRACTION = 0.2  # refit once incremental adds/removes exceed this share of the catalog
+REFIT_OOV_INCREASE = 0.1  # ...or new movies' out-of-vocabulary rate rises this much above training
+DRIFT_SAMPLE_SIZE = 1000  # training documents sampled for the baseline out-of-vocabulary rate
+FUZZY_MATCH_THRESHOLD = 0.5  # minimum title similarity to accept a fuzzy match
+
+# UI Configuration
+DEFAULT_RECOMMENDATIONS = 5
+MAX_RECOMMENDATIONS = 10
+TITLE_SUGGESTIONS = 5
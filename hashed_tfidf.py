@@ -0,0 +1,151 @@
+from itertools import islice
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+
+class HashedTfidfVectorizer:
+    """
+    TF-IDF over hashed features, without a vocabulary
+
+    Terms are hashed into n_features buckets by a stateless
+    HashingVectorizer, so ingest needs only fixed-size document-frequency
+    counts instead of a growing term dictionary. min_df, max_df and
+    max_features are applied to the buckets as TfidfVectorizer applies
+    them to terms. The fitted state is just the sorted ids of the kept
+    buckets and their IDF weights, which become the output columns.
+
+    fit() keeps only those counts while reading, and transform() keeps
+    only the kept buckets of each chunk_size chunk, so fitting with one
+    pass over the texts and transforming with a second holds at most one
+    unpruned chunk in memory besides the result.
+    """
+    def __init__(self, n_features=2 ** 18, stop_words='english', ngram_range=(1, 2),
+                 max_features=None, min_df=1, max_df=1.0, chunk_size=50000):
+        self.n_features = n_features
+        self.stop_words = stop_words
+        self.ngram_range = tuple(ngram_range)
+        self.max_features = max_features
+        self.min_df = min_df
+        self.max_df = max_df
+        self.chunk_size = chunk_size
+        self.hasher = HashingVectorizer(
+            n_features=n_features, stop_words=stop_words, ngram_range=self.ngram_range,
+            alternate_sign=False, norm=None
+        )
+        self.feature_ids_ = None
+        self.idf_ = None
+
+    def get_params(self):
+        """
+        Constructor arguments, for storing alongside the fitted arrays
+        """
+        return {
+            'n_features': self.n_features,
+            'stop_words': self.stop_words,
+            'ngram_range': list(self.ngram_range),
+            'max_features': self.max_features,
+            'min_df': self.min_df,
+            'max_df': self.max_df,
+            'chunk_size': self.chunk_size
+        }
+
+    def build_tokenizer(self):
+        return self.hasher.build_tokenizer()
+
+    def get_stop_words(self):
+        return self.hasher.get_stop_words()
+
+    def contains(self, term):
+        """
+        True if the bucket term hashes to was kept by fit
+        """
+        bucket = abs(murmurhash3_32(term, seed=0)) % self.n_features
+        position = np.searchsorted(self.feature_ids_, bucket)
+        return position < len(self.feature_ids_) and self.feature_ids_[position] == bucket
+
+    def _batches(self, texts):
+        texts = iter(texts)
+        while True:
+            batch = list(islice(texts, self.chunk_size))
+            if not batch:
+                return
+            yield batch
+
+    def fit(self, texts):
+        """
+        Fit the kept buckets and IDF weights on an iterable of texts, keeping
+        only per-bucket counts while reading
+        """
+        doc_counts = np.zeros(self.n_features, dtype=np.int64)
+        term_counts = np.zeros(self.n_features, dtype=np.float64)
+        n_docs = 0
+        for batch in self._batches(texts):
+            counts = self.hasher.transform(batch).tocsr()
+            doc_counts += np.bincount(counts.indices, minlength=self.n_features)
+            term_counts += np.bincount(counts.indices, weights=counts.data, minlength=self.n_features)
+            n_docs += len(batch)
+        if not n_docs:
+            raise ValueError("No documents to fit")
+
+        # Document-frequency limits as TfidfVectorizer interprets them
+        max_doc_count = self.max_df if isinstance(self.max_df, int) else self.max_df * n_docs
+        min_doc_count = self.min_df if isinstance(self.min_df, int) else self.min_df * n_docs
+        kept = np.flatnonzero((doc_counts >= min_doc_count) & (doc_counts <= max_doc_count))
+        if self.max_features is not None and len(kept) > self.max_features:
+            kept = kept[np.argsort(-term_counts[kept], kind='stable')[:self.max_features]]
+
+        self.feature_ids_ = np.sort(kept).astype(np.int32)
+        self.idf_ = np.log((1 + n_docs) / (1 + doc_counts[self.feature_ids_])) + 1
+        return self
+
+    def transform(self, texts):
+        """
+        L2-normalised TF-IDF matrix of an iterable of texts over the kept
+        buckets, hashed chunk_size texts at a time
+        """
+        chunks = [
+            self.hasher.transform(batch).tocsr()[:, self.feature_ids_]
+            for batch in self._batches(texts)
+        ]
+        if not chunks:
+            return sparse.csr_matrix((0, len(self.feature_ids_)))
+        return self._weight(sparse.vstack(chunks).tocsr())
+
+    def fit_transform(self, texts):
+        """
+        fit() and transform() on the same texts, which are held in memory
+        between the two passes; for bounded memory over a large corpus call
+        fit() and transform() on two passes over the source instead
+        """
+        texts = list(texts)
+        return self.fit(texts).transform(texts)
+
+    def _weight(self, matrix):
+        matrix.data *= self.idf_[matrix.indices]
+        return normalize(matrix)
+
+def neighbor_overlap(reference, matrix, k=10, n_queries=200, random_state=0):
+    """
+    Mean share of each sampled row's top-k neighbors under reference that
+    matrix also ranks in its top k; both are L2-normalised row matrices
+    """
+    rng = np.random.default_rng(random_state)
+    n_rows = reference.shape[0]
+    queries = rng.choice(n_rows, min(n_queries, n_rows), replace=False)
+    k = min(k, n_rows - 1)
+    if k < 1:
+        return 1.0
+
+    def top_k(features):
+        scores = (features[queries] @ features.T).toarray()
+        scores[np.arange(len(queries)), queries] = -np.inf
+        return np.argpartition(scores, n_rows - k, axis=1)[:, -k:]
+
+    found = sum(
+        len(np.intersect1d(expected, actual))
+        for expected, actual in zip(top_k(reference), top_k(matrix))
+    )
+    return found / (k * len(queries))
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime
+
+import numpy as np
+
+# Bumped whenever the stored files change; older artifacts are rejected and must be retrained
+FORMAT_VERSION = 4
+MANIFEST_FILE = 'manifest.json'
+
+def is_artifact(path):
+    """
+    True if path is a model artifact directory rather than a legacy pickle
+    """
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, MANIFEST_FILE))
+
+def file_checksum(filename):
+    """
+    SHA-256 of a file, read in 1 MB chunks
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ArtifactWriter:
+    """
+    Writes one version of a model artifact directory
+
+    Every file name carries the build id, so a new version never
+    overwrites a file that another process may still have memory-mapped.
+    The manifest is written last and atomically; until then readers keep
+    seeing the previous version. finish() then deletes the files of older
+    versions, ignoring any that are still locked. The previous version's
+    files are kept: a server still running on them, or one that loaded
+    the old manifest just before it was replaced, can finish its load and
+    keep serving until it reloads, and the version can be rolled back to.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.build_id = datetime.now().strftime('%Y%m%d%H%M%S') + '-' + uuid.uuid4().hex[:8]
+        self.files = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, name, extension):
+        """
+        Reserve the file for name in this version and return its path
+        """
+        filename = f"{name}.{self.build_id}.{extension}"
+        self.files[name] = filename
+        return os.path.join(self.directory, filename)
+
+    def write_array(self, name, array):
+        """
+        Store a NumPy array as a raw .npy file
+        """
+        np.save(self.path(name, 'npy'), np.ascontiguousarray(array))
+
+    def write_json(self, name, data):
+        """
+        Store JSON-serialisable data
+        """
+        with open(self.path(name, 'json'), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    def finish(self, metadata):
+        """
+        Write the manifest, making this version visible, and return it
+        """
+        checksums = {
+            name: file_checksum(os.path.join(self.directory, filename))
+            for name, filename in self.files.items()
+        }
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'model_version': self.build_id,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'files': self.files,
+            'checksums': checksums,
+            **metadata
+        }
+
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        previous_files = set()
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                previous_files = set(json.load(f).get('files', {}).values())
+        except (OSError, ValueError, AttributeError):
+            pass
+
+        tmp_path = f"{manifest_path}.{self.build_id}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+        # Remove files from versions before the previous one
+        keep = set(self.files.values()) | previous_files | {MANIFEST_FILE}
+        for filename in os.listdir(self.directory):
+            if filename.endswith(('.npy', '.json', '.csv')) and filename not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    pass
+
+        return manifest
+
+class ArtifactReader:
+    """
+    Reads the version of a model artifact named by its manifest
+
+    Arrays are opened with mmap_mode='r', so they are paged in on demand
+    and processes on one host share a single page-cached copy.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_FILE), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+        if self.manifest.get('format_version') != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported model format version {self.manifest.get('format_version')}"
+            )
+
+    def __contains__(self, name):
+        return name in self.manifest['files']
+
+    def path(self, name):
+        return os.path.join(self.directory, self.manifest['files'][name])
+
+    def read_array(self, name):
+        """
+        Memory-map a stored array, or return None if it was not saved
+        """
+        if name not in self:
+            return None
+        return np.load(self.path(name), mmap_mode='r')
+
+    def read_json(self, name):
+        with open(self.path(name), encoding='utf-8') as f:
+            return json.load(f)
+
+    def verify(self):
+        """
+        Check every file against the checksum recorded in the manifest
+        """
+        for name, checksum in self.manifest['checksums'].items():
+            if file_checksum(self.path(name)) != checksum:
+                raise ValueError(f"Checksum mismatch for '{name}'")
@@ -0,0 +1,233 @@
+import os
+import threading
+import time
+
+from config import (
+    MODEL_DIR, MODEL_FILE, MODEL_RELOAD_INTERVAL, RESULT_CACHE_FILE, RESULT_CACHE_SIZE,
+    RESULT_CACHE_TTL
+)
+from model_artifact import ArtifactReader, is_artifact
+from movie_recommender import MovieRecommender
+from result_cache import ResultCache
+
+def validate_model(recommender):
+    """
+    Sanity-check a freshly loaded model before it is put into service
+    """
+    n_movies = len(recommender.movies)
+    if n_movies == 0:
+        raise ValueError("Model has no movies")
+    if recommender.tfidf_matrix is not None and recommender.tfidf_matrix.shape[0] != n_movies:
+        raise ValueError("TF-IDF matrix does not match the movie catalog")
+    if recommender.neighbor_ids is not None and recommender.neighbor_ids.shape[0] != n_movies:
+        raise ValueError("Neighbor table does not match the movie catalog")
+    if recommender.title_search is None or len(recommender.title_index) != n_movies:
+        raise ValueError("Title lookups do not match the movie catalog")
+
+    # The model must be able to answer a real request
+    recommendations, error = recommender.get_recommendations(recommender.movies.title[0])
+    if error:
+        raise ValueError(f"Test recommendation failed: {error}")
+
+class ModelHolder:
+    """
+    Process-wide holder of one loaded MovieRecommender
+
+    The model is loaded once, on first use, and then shared read-only by
+    every Streamlit session in the process. Callers should take the
+    recommender once per request (recommender = holder.get()) and use that
+    reference throughout: a reload swaps in a new object, and requests
+    already running finish on the old one.
+
+    With watching enabled a background thread polls the model's version
+    (the artifact manifest, or a pickle's mtime and size). A new version is
+    loaded, checksum-verified and validated off the request path, and only
+    then swapped in; if it fails, the current model keeps serving.
+
+    get_recommendations() serves repeated requests from a ResultCache,
+    which is invalidated whenever a different model is swapped in.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.cache = ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL, RESULT_CACHE_FILE)
+        self.recommender = None
+        self.previous = None
+        self.version = None
+        self.failed_version = None
+        self.load_seconds = None
+        self.loaded_at = None
+        self.error = None
+        self._lock = threading.Lock()
+        self._watcher = None
+
+    def get(self):
+        """
+        Return the shared recommender, loading it on first use; None if loading failed
+        """
+        if self.recommender is None:
+            with self._lock:
+                if self.recommender is None:
+                    self.load()
+        return self.recommender
+
+    def current_version(self):
+        """
+        Version of the model on disk: the manifest's model_version, or a
+        pickle's mtime and size
+        """
+        if is_artifact(self.path):
+            return ArtifactReader(self.path).manifest['model_version']
+        stat = os.stat(self.path)
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def load_candidate(self, verify):
+        """
+        Load and validate the model on disk without putting it into service
+
+        Returns (recommender, version, error). version is the one actually
+        read, which may be newer than the last poll saw; it is None if not
+        even the manifest could be read, and recommender is None on error.
+        """
+        version = None
+        try:
+            recommender = MovieRecommender()
+            if is_artifact(self.path):
+                reader = ArtifactReader(self.path)
+                version = reader.manifest['model_version']
+                if verify:
+                    reader.verify()
+                recommender.load_artifact(reader)
+            else:
+                version = self.current_version()
+                recommender.load_pickle(self.path)
+
+            validate_model(recommender)
+            return recommender, version, None
+        except Exception as e:
+            return None, version, str(e)
+
+    def load(self, verify=False):
+        """
+        Load the model from self.path and swap it in; returns True on success
+        """
+        start = time.perf_counter()
+        recommender, version, error = self.load_candidate(verify)
+        if error:
+            self.error = f"Could not load model from {self.path}: {error}"
+            print(self.error)
+            # Watchers skip this version until a newer one is written
+            self.failed_version = version
+            return False
+
+        self.swap(recommender, version)
+        self.load_seconds = time.perf_counter() - start
+        return True
+
+    def swap(self, recommender, version):
+        """
+        Put a loaded model into service, keeping the old one for rollback
+        """
+        self.previous = (self.recommender, self.version) if self.recommender is not None else None
+        self.recommender = recommender
+        self.version = version
+        self.loaded_at = time.time()
+        self.failed_version = None
+        self.error = None
+        self.cache.invalidate(version)
+
+    def reload_if_changed(self):
+        """
+        Load and swap in the model on disk if its version changed; returns True if swapped
+        """
+        try:
+            version = self.current_version()
+        except (OSError, ValueError):
+            # Mid-write or missing; try again on the next poll
+            return False
+        if version in (self.version, self.failed_version):
+            return False
+
+        with self._lock:
+            if self.load(verify=True):
+                print(f"Model reloaded: version {self.version}")
+                return True
+
+        # Keep serving the current model; load() recorded the version it
+        # failed on, which may be newer than the one polled
+        return False
+
+    def rollback(self):
+        """
+        Go back to the model that was in service before the last reload
+        """
+        with self._lock:
+            if self.previous is None:
+                return False
+            recommender, version = self.previous
+            self.previous = (self.recommender, self.version)
+            self.recommender = recommender
+            self.version = version
+            self.loaded_at = time.time()
+            self.cache.invalidate(version)
+            return True
+
+    def get_recommendations(self, movie_title, top_n=5, **filters):
+        """
+        MovieRecommender.get_recommendations on the model in service,
+        answered from the result cache when the same request was seen;
+        filters are its genre, year_range and min_rating arguments
+        """
+        recommender = self.get()
+        if recommender is None:
+            return None, f"Model not available: {self.error}"
+        version = self.version
+
+        filters = {name: value for name, value in filters.items() if value is not None}
+        key = self.cache.make_key(movie_title, top_n, filters, version)
+        recommendations = self.cache.get(key)
+        if recommendations is not None:
+            return recommendations, None
+
+        recommendations, error = recommender.get_recommendations(movie_title, top_n, **filters)
+
+        # Don't cache a result if another model was swapped in meanwhile
+        if error is None and recommender is self.recommender and version == self.version:
+            self.cache.put(key, recommendations, version)
+        return recommendations, error
+
+    def start_watching(self, interval=MODEL_RELOAD_INTERVAL):
+        """
+        Poll for new model versions every interval seconds in a daemon thread
+        """
+        if self._watcher is not None or not interval:
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=watch, name=f"model-watcher:{self.path}", daemon=True)
+        self._watcher.start()
+
+_holders = {}
+_holders_lock = threading.Lock()
+
+def default_model_path():
+    """
+    The artifact directory if it holds a model, else the legacy pickle
+    """
+    return MODEL_DIR if is_artifact(MODEL_DIR) else MODEL_FILE
+
+def get_model_holder(path=None, watch=True):
+    """
+    The process-wide ModelHolder for path (default: default_model_path()),
+    watching for new model versions unless watch is False
+    """
+    path = path or default_model_path()
+    with _holders_lock:
+        if path not in _holders:
+            _holders[path] = ModelHolder(path)
+            if watch:
+                _holders[path].start_watching()
+        return _holders[path]
@@ -1,199 +1,1185 @@
-import pandas as pd
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import pickle
-import re
-import os
-
-class MovieRecommender:
-    def __init__(self):
-        self.tfidf_vectorizer = TfidfVectorizer(
-            max_features=5000,
-            stop_words='english',
-            ngram_range=(1, 2),
-            min_df=2,
-            max_df=0.8
-        )
-        self.movies_df = None
-        self.tfidf_matrix = None
-        self.similarity_matrix = None
-        
-    def preprocess_data(self, csv_file):
-        """
-        Load and preprocess movie data from CSV file
-        """
-        try:
-            # Load the dataset
-            self.movies_df = pd.read_csv(csv_file)
-            
-            # Clean and preprocess the data
-            self.movies_df = self.movies_df.dropna(subset=['title', 'overview'])
-            
-            # Create a combined feature for TF-IDF
-            self.movies_df['combined_features'] = (
-                self.movies_df['overview'].fillna('') + ' ' +
-                self.movies_df['genre'].fillna('') + ' ' +
-                self.movies_df['title'].fillna('')
-            )
-            
-            # Clean the combined features
-            self.movies_df['combined_features'] = self.movies_df['combined_features'].apply(
-                lambda x: re.sub(r'[^a-zA-Z\s]', '', str(x).lower())
-            )
-            
-            print(f"Loaded {len(self.movies_df)} movies successfully")
-            return True
-            
-        except Exception as e:
-            print(f"Error loading data: {str(e)}")
-            return False
-    
-    def build_model(self):
-        """
-        Build TF-IDF model and compute similarity matrix
-        """
-        try:
-            # Fit TF-IDF vectorizer
-            self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(
-                self.movies_df['combined_features']
-            )
-            
-            # Compute cosine similarity matrix
-            self.similarity_matrix = cosine_similarity(self.tfidf_matrix)
-            
-            print("Model built successfully")
-            return True
-            
-        except Exception as e:
-            print(f"Error building model: {str(e)}")
-            return False
-    
-    def get_recommendations(self, movie_title, top_n=5):
-        """
-        Get movie recommendations based on title
-        """
-        try:
-            # Find the movie index
-            movie_idx = self.movies_df[
-                self.movies_df['title'].str.lower() == movie_title.lower()
-            ].index
-            
-            if len(movie_idx) == 0:
-                # Try partial matching
-                movie_idx = self.movies_df[
-                    self.movies_df['title'].str.lower().str.contains(
-                        movie_title.lower(), na=False
-                    )
-                ].index
-                
-                if len(movie_idx) == 0:
-                    return None, "Movie not found in database"
-            
-            # Get the first match
-            movie_idx = movie_idx[0]
-            
-            # Get similarity scores
-            similarity_scores = list(enumerate(self.similarity_matrix[movie_idx]))
-            
-            # Sort by similarity score
-            similarity_scores = sorted(similarity_scores, key=lambda x: x[1], reverse=True)
-            
-            # Get top N recommendations (excluding the movie itself)
-            top_movies = similarity_scores[1:top_n+1]
-            
-            # Extract movie information
-            recommendations = []
-            for idx, score in top_movies:
-                movie_info = {
-                    'title': self.movies_df.iloc[idx]['title'],
-                    'genre': self.movies_df.iloc[idx]['genre'],
-                    'overview': self.movies_df.iloc[idx]['overview'],
-                    'rating': self.movies_df.iloc[idx].get('rating', 'N/A'),
-                    'year': self.movies_df.iloc[idx].get('year', 'N/A'),
-                    'similarity_score': round(score, 3)
-                }
-                recommendations.append(movie_info)
-            
-            return recommendations, None
-            
-        except Exception as e:
-            return None, f"Error getting recommendations: {str(e)}"
-    
-    def save_model(self, filename='model.pkl'):
-        """
-        Save the trained model
-        """
-        try:
-            model_data = {
-                'tfidf_vectorizer': self.tfidf_vectorizer,
-                'tfidf_matrix': self.tfidf_matrix,
-                'similarity_matrix': self.similarity_matrix,
-                'movies_df': self.movies_df
-            }
-            
-            with open(filename, 'wb') as f:
-                pickle.dump(model_data, f)
-            
-            print(f"Model saved as {filename}")
-            return True
-            
-        except Exception as e:
-            print(f"Error saving model: {str(e)}")
-            return False
-    
-    def load_model(self, filename='model.pkl'):
-        """
-        Load a pre-trained model
-        """
-        try:
-            with open(filename, 'rb') as f:
-                model_data = pickle.load(f)
-            
-            self.tfidf_vectorizer = model_data['tfidf_vectorizer']
-            self.tfidf_matrix = model_data['tfidf_matrix']
-            self.similarity_matrix = model_data['similarity_matrix']
-            self.movies_df = model_data['movies_df']
-            
-            print(f"Model loaded from {filename}")
-            return True
-            
-        except Exception as e:
-            print(f"Error loading model: {str(e)}")
-            return False
-    
-    def get_movie_list(self):
-        """
-        Get list of all movies in the dataset
-        """
-        if self.movies_df is not None:
-            return self.movies_df['title'].tolist()
-        return []
-
-def train_model(csv_file='sample_movies.csv', model_file='model.pkl'):
-    """
-    Train and save the movie recommendation model
-    """
-    recommender = MovieRecommender()
-    
-    # Load and preprocess data
-    if not recommender.preprocess_data(csv_file):
-        return False
-    
-    # Build model
-    if not recommender.build_model():
-        return False
-    
-    # Save model
-    if not recommender.save_model(model_file):
-        return False
-    
-    return True
-
-if __name__ == "__main__":
-    # Train the model
-    success = train_model()
-    if success:
-        print("Model training completed successfully!")
-    else:
-        print("Model training failed!")
+import pandas as pd
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.decomposition import TruncatedSVD
+import pickle
+import json
+import mmap
+import re
+import os
+import time
+import argparse
+from ann_index import IVFIndex, measure_recall
+from config import (
+    ANN_N_LISTS, ANN_N_PROBE, CSV_CHUNK_SIZE, DRIFT_SAMPLE_SIZE, EMBEDDING_DIM,
+    FEATURE_SAMPLE_SIZE, FUZZY_MATCH_THRESHOLD, HASH_N_FEATURES, MODEL_DIR, NEIGHBOR_TOP_K,
+    REFIT_CHANGE_FRACTION, REFIT_OOV_INCREASE, SIMILARITY_BLOCK_SIZE, TITLE_SUGGESTIONS
+)
+from hashed_tfidf import HashedTfidfVectorizer, neighbor_overlap
+from model_artifact import ArtifactReader, ArtifactWriter, is_artifact
+from movie_store import MISSING_TMDB_ID, MovieStore
+from parallel_build import ordered_map, parallel_neighbors, resolve_workers
+from title_index import TitleIndex
+from title_search import TitleSearchEngine
+from tmdb_enrichment import enrich_catalog
+from tmdb_integration import TMDBIntegration, enrichment_file_for
+
+# TfidfVectorizer settings stored in the model artifact next to its vocabulary
+VECTORIZER_PARAMS = (
+    'lowercase', 'stop_words', 'ngram_range', 'max_features', 'min_df', 'max_df',
+    'norm', 'use_idf', 'smooth_idf', 'sublinear_tf'
+)
+
+# Shared by the TF-IDF and hashed feature modes
+FEATURE_PARAMS = {
+    'max_features': 5000,
+    'stop_words': 'english',
+    'ngram_range': (1, 2),
+    'min_df': 2,
+    'max_df': 0.8
+}
+
+# Optional arrays stored in the model artifact under the same attribute name
+MODEL_ARRAYS = ('neighbor_ids', 'neighbor_scores', 'svd_components', 'embeddings')
+
+# Movie columns kept for serving; anything else in the CSV is never loaded
+MOVIE_COLUMNS = ('title', 'genre', 'overview', 'rating', 'year', 'tmdb_id')
+TEXT_COLUMNS = ('title', 'genre', 'overview')
+
+def clean_text(text):
+    """
+    Lowercase text and keep only letters and whitespace
+    """
+    return re.sub(r'[^a-zA-Z\s]', '', str(text).lower())
+
+def combined_features(movies_df):
+    """
+    Cleaned overview + genre + title text that the vectorizer is fitted on
+
+    Same result as clean_text, but with vectorised string operations.
+    """
+    overview, genre, title = (
+        movies_df[column].astype(object).fillna('').astype(str)
+        for column in ('overview', 'genre', 'title')
+    )
+    combined = overview + ' ' + genre + ' ' + title
+    return combined.str.lower().str.replace(r'[^a-z\s]', '', regex=True)
+
+def compact_movie_columns(movies_df):
+    """
+    Keep the serving columns with compact dtypes: float32 rating, nullable
+    Int16 year, nullable Int32 TMDB id and categorical genre
+    """
+    movies_df = movies_df[[column for column in MOVIE_COLUMNS if column in movies_df]]
+    if 'rating' in movies_df:
+        movies_df = movies_df.assign(
+            rating=pd.to_numeric(movies_df['rating'], errors='coerce').astype(np.float32)
+        )
+    if 'year' in movies_df:
+        movies_df = movies_df.assign(
+            year=pd.to_numeric(movies_df['year'], errors='coerce').round().astype('Int16')
+        )
+    if 'tmdb_id' in movies_df:
+        movies_df = movies_df.assign(
+            tmdb_id=pd.to_numeric(movies_df['tmdb_id'], errors='coerce').astype('Int32')
+        )
+    if 'genre' in movies_df and not isinstance(movies_df['genre'].dtype, pd.CategoricalDtype):
+        movies_df = movies_df.assign(genre=movies_df['genre'].astype('category'))
+    return movies_df
+
+def read_movies_csv(csv_file, chunk_size=CSV_CHUNK_SIZE):
+    """
+    Read a movie CSV in chunks of chunk_size rows, keeping only serving
+    columns and rows with a title and overview
+
+    Each chunk is compacted as it is read, so peak memory stays close to
+    the size of the result rather than a multiple of the file.
+    """
+    chunks = []
+    reader = pd.read_csv(
+        csv_file,
+        usecols=lambda column: column in MOVIE_COLUMNS,
+        dtype={column: str for column in TEXT_COLUMNS},
+        chunksize=chunk_size
+    )
+    for chunk in reader:
+        chunks.append(compact_movie_columns(chunk.dropna(subset=['title', 'overview'])))
+    
+    if not chunks:
+        raise ValueError(f"No movies found in {csv_file}")
+    
+    # Chunks have their own genre categories; merge them without going through strings
+    genres = None
+    if 'genre' in chunks[0]:
+        genres = pd.api.types.union_categoricals([chunk['genre'] for chunk in chunks])
+    movies_df = pd.concat([chunk.drop(columns='genre', errors='ignore') for chunk in chunks], ignore_index=True)
+    if genres is not None:
+        movies_df.insert(list(chunks[0].columns).index('genre'), 'genre', genres)
+    return movies_df
+
+def select_top_n(scores, top_n, exclude=None):
+    """
+    Return (indices, scores) of the top_n highest scores, best first
+
+    Uses argpartition so only the selected entries are sorted. Indices in
+    exclude are never returned. scores may be modified in place.
+    """
+    if exclude is not None:
+        scores[exclude] = -np.inf
+    
+    top_n = min(top_n, len(scores))
+    if top_n <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=scores.dtype)
+    
+    if top_n < len(scores):
+        top = np.argpartition(scores, len(scores) - top_n)[-top_n:]
+    else:
+        top = np.arange(len(scores))
+    
+    # Highest score first, lower index first on ties
+    top_scores = scores[top]
+    order = np.lexsort((top, -top_scores))
+    top, top_scores = top[order], top_scores[order]
+    
+    keep = top_scores > -np.inf
+    return top[keep], top_scores[keep]
+
+def select_top_n_rows(scores, top_n):
+    """
+    Row-wise select_top_n over a 2-D block of scores
+
+    Returns (ids, scores) arrays of shape rows x top_n, best first. Slots
+    that cannot be filled (-inf scores) get id -1.
+    """
+    n_rows, n_cols = scores.shape
+    k = min(top_n, n_cols)
+    
+    if k < n_cols:
+        top = np.argpartition(scores, n_cols - k, axis=1)[:, -k:]
+    else:
+        top = np.broadcast_to(np.arange(n_cols), (n_rows, n_cols))
+    
+    # Highest score first, lower index first on ties
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.lexsort((top, -top_scores), axis=1)
+    
+    ids = np.full((n_rows, top_n), -1, dtype=np.int32)
+    top_scores_out = np.full((n_rows, top_n), -np.inf, dtype=np.float32)
+    ids[:, :k] = np.take_along_axis(top, order, axis=1)
+    top_scores_out[:, :k] = np.take_along_axis(top_scores, order, axis=1)
+    ids[top_scores_out == -np.inf] = -1
+    return ids, top_scores_out
+
+def neighbor_block(tfidf_matrix, embeddings, start, stop, top_k):
+    """
+    Neighbor ids and scores for catalog rows start:stop, scored against the
+    embeddings if given, else the TF-IDF matrix
+    """
+    if embeddings is not None:
+        block = embeddings[start:stop] @ embeddings.T
+    else:
+        block = (tfidf_matrix[start:stop] @ tfidf_matrix.T).toarray()
+    
+    # A movie is never its own neighbor
+    rows = np.arange(stop - start)
+    block[rows, rows + start] = -np.inf
+    
+    return select_top_n_rows(block, top_k)
+
+def is_memory_mapped(array):
+    """
+    True if array is a memory-mapped file or a view of one, through any
+    number of .base levels
+    """
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+class RecommendationBatch:
+    """
+    Columnar result of MovieRecommender.get_recommendations_batch
+
+    ids and scores are len(titles) x top_n arrays. Titles that were not
+    found have seed id -1, and unfilled slots have id -1. Recommendation
+    dicts are only built when asked for.
+    """
+    def __init__(self, recommender, titles, seed_ids, ids, scores):
+        self.recommender = recommender
+        self.titles = list(titles)
+        self.seed_ids = seed_ids
+        self.ids = ids
+        self.scores = scores
+    
+    def __len__(self):
+        return len(self.titles)
+    
+    def __iter__(self):
+        for i, title in enumerate(self.titles):
+            yield title, self.recommendations(i)
+    
+    def recommendations(self, i):
+        """
+        Recommendation dicts for the i-th title, or None if it was not found
+        """
+        if self.seed_ids[i] < 0:
+            return None
+        keep = self.ids[i] >= 0
+        return self.recommender.format_recommendations(self.ids[i][keep], self.scores[i][keep])
+
+class MovieRecommender:
+    def __init__(self, features='tfidf'):
+        """
+        features picks the text features: 'tfidf' (vocabulary-based) or
+        'hashing' (HashedTfidfVectorizer, no vocabulary to build or store)
+        """
+        if features == 'hashing':
+            self.tfidf_vectorizer = HashedTfidfVectorizer(
+                n_features=HASH_N_FEATURES, chunk_size=CSV_CHUNK_SIZE, **FEATURE_PARAMS
+            )
+        elif features == 'tfidf':
+            self.tfidf_vectorizer = TfidfVectorizer(**FEATURE_PARAMS)
+        else:
+            raise ValueError(f"Unknown feature mode '{features}'")
+        self.movies = None
+        self.tfidf_matrix = None
+        self.title_index = None
+        self.title_search = None
+        self.neighbor_ids = None
+        self.neighbor_scores = None
+        self.ann_index = None
+        self.svd_components = None
+        self.embeddings = None
+        self.model_version = None
+        self.vocabulary_stats = None
+        
+    def preprocess_data(self, csv_file, chunk_size=CSV_CHUNK_SIZE):
+        """
+        Load and preprocess movie data from CSV file, chunk_size rows at a time
+
+        Movies are kept in a columnar MovieStore. The cleaned text the
+        vectorizer needs is not stored; build_model generates it chunk by
+        chunk with iter_combined_features().
+        """
+        try:
+            # Load the dataset, dropping movies without a title or overview
+            self.movies = MovieStore.from_frame(read_movies_csv(csv_file, chunk_size))
+            self.build_title_lookups()
+            
+            print(f"Loaded {len(self.movies)} movies successfully")
+            return True
+            
+        except Exception as e:
+            print(f"Error loading data: {str(e)}")
+            return False
+    
+    def iter_combined_features(self, chunk_size=CSV_CHUNK_SIZE, workers=1):
+        """
+        Yield the cleaned text of every movie, cleaning chunk_size movies at
+        a time, in a pool of worker processes if workers > 1
+        """
+        chunks = (
+            self.movies.text_frame(np.arange(start, min(start + chunk_size, len(self.movies))))
+            for start in range(0, len(self.movies), chunk_size)
+        )
+        if workers > 1:
+            cleaned = ordered_map(combined_features, chunks, workers)
+        else:
+            cleaned = map(combined_features, chunks)
+        
+        for texts in cleaned:
+            yield from texts
+    
+    def build_title_lookups(self):
+        """
+        Build the exact/partial title index and the fuzzy search engine
+        """
+        self.title_index = TitleIndex.build(self.movies.titles())
+        self.title_search = TitleSearchEngine.build(self.movies.title, self.title_index)
+    
+    def build_model(self, top_k=None, ann=False, embedding_dim=None, workers=1, n_probe=ANN_N_PROBE):
+        """
+        Build TF-IDF model, plus the neighbor table if top_k is given, the
+        approximate nearest-neighbour index (visiting n_probe lists per
+        query) if ann is set and dense SVD embeddings if embedding_dim is given
+
+        With workers > 1 (0 = every core) text cleaning and the neighbor
+        table are computed in worker processes; the model is identical to
+        a serial build.
+
+        Rows of the TF-IDF matrix are L2-normalised, so cosine similarity is
+        a plain dot product and is computed per query instead of as a dense
+        N x N matrix.
+        """
+        try:
+            # Fit TF-IDF vectorizer
+            if isinstance(self.tfidf_vectorizer, HashedTfidfVectorizer):
+                # Two passes over the regenerated text, so ingest memory does not grow with the catalog
+                self.tfidf_vectorizer.fit(self.iter_combined_features(workers=workers))
+                self.tfidf_matrix = self.tfidf_vectorizer.transform(self.iter_combined_features(workers=workers))
+            else:
+                self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(
+                    self.iter_combined_features(workers=workers)
+                ).tocsr()
+            
+            # Baseline for detecting vocabulary drift in later incremental updates
+            sample = combined_features(
+                self.movies.text_frame(np.arange(min(DRIFT_SAMPLE_SIZE, len(self.movies))))
+            )
+            oov_tokens, tokens = self.count_oov_tokens(sample)
+            self.vocabulary_stats = {
+                'base_movies': len(self.movies),
+                'base_oov_rate': oov_tokens / max(tokens, 1),
+                'added_movies': 0,
+                'removed_movies': 0,
+                'added_tokens': 0,
+                'added_oov_tokens': 0
+            }
+            
+            # Embeddings first, so the neighbor table matches the serving scores
+            if embedding_dim:
+                self.build_embeddings(embedding_dim)
+            
+            if top_k:
+                self.build_neighbor_index(top_k, workers=workers)
+            
+            if ann:
+                self.build_ann_index(n_probe=n_probe)
+            
+            print("Model built successfully")
+            return True
+            
+        except Exception as e:
+            print(f"Error building model: {str(e)}")
+            return False
+    
+    def build_neighbor_index(self, top_k, block_size=SIMILARITY_BLOCK_SIZE, workers=1):
+        """
+        Precompute the top_k most similar movies for every movie
+
+        Similarities are computed block_size rows at a time, so peak memory
+        is block_size x N rather than N x N. The result is an N x K int32
+        table of neighbor ids with a matching float32 table of scores.
+        With workers > 1 the blocks are spread over worker processes.
+        """
+        n_movies = self.tfidf_matrix.shape[0]
+        top_k = min(top_k, n_movies - 1)
+        
+        if workers > 1 and n_movies > block_size:
+            self.neighbor_ids, self.neighbor_scores = parallel_neighbors(
+                neighbor_block, self.tfidf_matrix, self.embeddings, top_k, block_size, workers
+            )
+            return
+        
+        neighbor_ids = np.empty((n_movies, top_k), dtype=np.int32)
+        neighbor_scores = np.empty((n_movies, top_k), dtype=np.float32)
+        
+        for start in range(0, n_movies, block_size):
+            stop = min(start + block_size, n_movies)
+            neighbor_ids[start:stop], neighbor_scores[start:stop] = neighbor_block(
+                self.tfidf_matrix, self.embeddings, start, stop, top_k
+            )
+        
+        self.neighbor_ids = neighbor_ids
+        self.neighbor_scores = neighbor_scores
+    
+    def build_embeddings(self, embedding_dim=EMBEDDING_DIM):
+        """
+        Project the TF-IDF matrix to dense float32 embeddings with randomized SVD
+
+        The SVD components are kept so that new queries can be embedded the
+        same way; once embeddings exist, all scoring uses them.
+        """
+        embedding_dim = min(embedding_dim, self.tfidf_matrix.shape[1] - 1)
+        svd = TruncatedSVD(n_components=embedding_dim, algorithm='randomized', random_state=42)
+        embeddings = svd.fit_transform(self.tfidf_matrix)
+        
+        self.svd_components = np.ascontiguousarray(svd.components_, dtype=np.float32)
+        self.embeddings = np.ascontiguousarray(normalize(embeddings), dtype=np.float32)
+    
+    def embed(self, query_vector):
+        """
+        Embed 1 x F TF-IDF query vectors with the stored SVD projection
+        """
+        embedded = np.asarray(query_vector @ self.svd_components.T, dtype=np.float32)
+        return normalize(np.atleast_2d(embedded))
+    
+    def score_vector(self, query_vector, movie_ids=None):
+        """
+        Cosine similarity of a 1 x F query vector against the catalog,
+        or against movie_ids only
+        """
+        if self.embeddings is not None:
+            vectors = self.embeddings if movie_ids is None else self.embeddings[movie_ids]
+            return vectors @ self.embed(query_vector).ravel()
+        
+        matrix = self.tfidf_matrix if movie_ids is None else self.tfidf_matrix[movie_ids]
+        return (matrix @ query_vector.T).toarray().ravel()
+    
+    def score_rows(self, movie_ids):
+        """
+        Dense len(movie_ids) x N block of similarities for catalog movies
+        """
+        if self.embeddings is not None:
+            return self.embeddings[movie_ids] @ self.embeddings.T
+        return (self.tfidf_matrix[movie_ids] @ self.tfidf_matrix.T).toarray()
+    
+    def scoring_report(self, n_queries=100, random_state=0):
+        """
+        Memory and mean per-query latency of sparse vs dense embedding scoring
+        """
+        rng = np.random.default_rng(random_state)
+        n_movies = self.tfidf_matrix.shape[0]
+        queries = rng.choice(n_movies, min(n_queries, n_movies), replace=False)
+        
+        start = time.perf_counter()
+        for movie_idx in queries:
+            (self.tfidf_matrix @ self.tfidf_matrix[movie_idx].T).toarray()
+        sparse_ms = (time.perf_counter() - start) / len(queries) * 1000
+        
+        report = {
+            'sparse_bytes': (
+                self.tfidf_matrix.data.nbytes + self.tfidf_matrix.indices.nbytes +
+                self.tfidf_matrix.indptr.nbytes
+            ),
+            'sparse_ms': sparse_ms
+        }
+        
+        if self.embeddings is not None:
+            start = time.perf_counter()
+            for movie_idx in queries:
+                self.embeddings @ self.embeddings[movie_idx]
+            report['dense_bytes'] = self.embeddings.nbytes + self.svd_components.nbytes
+            report['dense_ms'] = (time.perf_counter() - start) / len(queries) * 1000
+        
+        return report
+    
+    def ann_report(self, k=10, n_queries=200):
+        """
+        Recall@k of the ANN index against exact scoring at its n_probe, with
+        the mean per-query latency of both
+        """
+        recall, exact_ms, ann_ms = measure_recall(self.ann_index, self.tfidf_matrix, k=k, n_queries=n_queries)
+        return {
+            'k': k,
+            'n_probe': self.ann_index.n_probe,
+            'recall': recall,
+            'exact_ms': exact_ms,
+            'ann_ms': ann_ms
+        }
+    
+    def feature_report(self, k=10, sample_size=FEATURE_SAMPLE_SIZE, n_queries=200):
+        """
+        Quality and size of hashed features against the TF-IDF vocabulary
+
+        Both vectorizers are fitted on the first sample_size movies.
+        'overlap' is the mean share of TF-IDF top-k neighbors the hashed
+        features also return; the byte counts are the fitted state each
+        mode stores in the artifact.
+        """
+        texts = combined_features(self.movies.text_frame(np.arange(min(sample_size, len(self.movies)))))
+        
+        reference = TfidfVectorizer(**FEATURE_PARAMS)
+        reference_matrix = reference.fit_transform(texts)
+        hashed = HashedTfidfVectorizer(n_features=HASH_N_FEATURES, **FEATURE_PARAMS)
+        hashed_matrix = hashed.fit_transform(texts)
+        
+        vocabulary = {term: int(i) for term, i in reference.vocabulary_.items()}
+        return {
+            'overlap': neighbor_overlap(reference_matrix, hashed_matrix, k, n_queries),
+            'tfidf_bytes': len(json.dumps(vocabulary)) + reference.idf_.nbytes,
+            'hashed_bytes': hashed.feature_ids_.nbytes + hashed.idf_.nbytes
+        }
+    
+    def count_oov_tokens(self, texts):
+        """
+        (out-of-vocabulary, total) counts of the non-stop-word tokens in cleaned texts
+        """
+        tokenize = self.tfidf_vectorizer.build_tokenizer()
+        stop_words = self.tfidf_vectorizer.get_stop_words() or frozenset()
+        if isinstance(self.tfidf_vectorizer, HashedTfidfVectorizer):
+            known = self.tfidf_vectorizer.contains
+        else:
+            known = self.tfidf_vectorizer.vocabulary_.__contains__
+        
+        oov_tokens = 0
+        tokens = 0
+        for text in texts:
+            for token in tokenize(text):
+                if token not in stop_words:
+                    tokens += 1
+                    oov_tokens += not known(token)
+        return oov_tokens, tokens
+    
+    def add_movies(self, new_movies_df):
+        """
+        Add movies to a built model without refitting the vectorizer
+
+        New rows are transformed with the existing vocabulary and appended
+        to the TF-IDF matrix (and embeddings and ANN index). Their neighbor
+        lists are computed, and existing lists are patched wherever a new
+        movie beats their current last entry. Vocabulary drift is tracked;
+        check needs_refit() afterwards.
+        """
+        try:
+            new_movies_df = compact_movie_columns(
+                new_movies_df.dropna(subset=['title', 'overview']).reset_index(drop=True)
+            )
+            texts = combined_features(new_movies_df)
+            new_matrix = self.tfidf_vectorizer.transform(texts).tocsr()
+            
+            n_old = self.tfidf_matrix.shape[0]
+            new_ids = np.arange(n_old, n_old + len(new_movies_df))
+            
+            self.movies = self.movies.append(MovieStore.from_frame(new_movies_df))
+            self.title_index = self.title_index.append(new_movies_df['title'])
+            self.title_search = self.title_search.append(self.movies.title, self.title_index)
+            
+            self.tfidf_matrix = sparse.vstack([self.tfidf_matrix, new_matrix]).tocsr()
+            if self.embeddings is not None:
+                self.embeddings = np.ascontiguousarray(
+                    np.vstack([self.embeddings, self.embed(new_matrix)]), dtype=np.float32
+                )
+            if self.ann_index is not None:
+                self.ann_index.add(new_matrix)
+            if self.neighbor_ids is not None:
+                self.patch_neighbors(new_ids)
+            
+            if self.vocabulary_stats is not None:
+                oov_tokens, tokens = self.count_oov_tokens(texts)
+                self.vocabulary_stats['added_movies'] += len(new_movies_df)
+                self.vocabulary_stats['added_tokens'] += tokens
+                self.vocabulary_stats['added_oov_tokens'] += oov_tokens
+            
+            print(f"Added {len(new_movies_df)} movies")
+            return True
+            
+        except Exception as e:
+            print(f"Error adding movies: {str(e)}")
+            return False
+    
+    def patch_neighbors(self, new_ids, block_size=SIMILARITY_BLOCK_SIZE):
+        """
+        Extend the neighbor table with rows for new_ids, which must be the
+        last rows of the catalog, and merge them into existing rows
+        """
+        top_k = self.neighbor_ids.shape[1]
+        n_old = new_ids[0]
+        neighbor_ids = np.vstack([self.neighbor_ids, np.full((len(new_ids), top_k), -1, dtype=np.int32)])
+        neighbor_scores = np.vstack([
+            self.neighbor_scores, np.full((len(new_ids), top_k), -np.inf, dtype=np.float32)
+        ])
+        
+        for start in range(0, len(new_ids), block_size):
+            chunk = new_ids[start:start + block_size]
+            block = self.score_rows(chunk)
+            block[np.arange(len(chunk)), chunk] = -np.inf
+            neighbor_ids[chunk], neighbor_scores[chunk] = select_top_n_rows(block, top_k)
+            
+            # Merge this chunk into the lists of the existing movies
+            merged_ids = np.hstack([neighbor_ids[:n_old], np.broadcast_to(chunk, (n_old, len(chunk)))])
+            merged_scores = np.hstack([neighbor_scores[:n_old], block[:, :n_old].T])
+            top, neighbor_scores[:n_old] = select_top_n_rows(merged_scores, top_k)
+            neighbor_ids[:n_old] = np.take_along_axis(merged_ids, np.maximum(top, 0), axis=1)
+            neighbor_ids[:n_old][top < 0] = -1
+        
+        self.neighbor_ids = neighbor_ids
+        self.neighbor_scores = neighbor_scores
+    
+    def remove_movies(self, movie_ids, block_size=SIMILARITY_BLOCK_SIZE):
+        """
+        Remove movies by row id; later row ids shift down to stay contiguous
+
+        Neighbor lists that referenced a removed movie are recomputed.
+        """
+        try:
+            keep = np.ones(len(self.movies), dtype=bool)
+            keep[list(movie_ids)] = False
+            new_id = np.cumsum(keep) - 1
+            
+            self.movies = self.movies.take(np.flatnonzero(keep))
+            self.title_index = self.title_index.take(np.flatnonzero(keep))
+            self.title_search = self.title_search.take(
+                np.flatnonzero(keep), self.movies.title, self.title_index
+            )
+            
+            self.tfidf_matrix = self.tfidf_matrix[keep]
+            if self.embeddings is not None:
+                self.embeddings = np.ascontiguousarray(self.embeddings[keep])
+            if self.ann_index is not None:
+                self.ann_index.remove(keep)
+            
+            if self.neighbor_ids is not None:
+                neighbor_ids = np.asarray(self.neighbor_ids)[keep]
+                neighbor_scores = np.array(self.neighbor_scores[keep])
+                
+                stale = ~np.all((neighbor_ids < 0) | keep[neighbor_ids], axis=1)
+                neighbor_ids = np.where(neighbor_ids >= 0, new_id[neighbor_ids], -1).astype(np.int32)
+                
+                stale_rows = np.flatnonzero(stale)
+                for start in range(0, len(stale_rows), block_size):
+                    chunk = stale_rows[start:start + block_size]
+                    block = self.score_rows(chunk)
+                    block[np.arange(len(chunk)), chunk] = -np.inf
+                    neighbor_ids[chunk], neighbor_scores[chunk] = select_top_n_rows(
+                        block, neighbor_ids.shape[1]
+                    )
+                
+                self.neighbor_ids = neighbor_ids
+                self.neighbor_scores = neighbor_scores
+            
+            if self.vocabulary_stats is not None:
+                self.vocabulary_stats['removed_movies'] += int((~keep).sum())
+            
+            print(f"Removed {int((~keep).sum())} movies")
+            return True
+            
+        except Exception as e:
+            print(f"Error removing movies: {str(e)}")
+            return False
+    
+    def needs_refit(self):
+        """
+        True once incremental updates have drifted far enough from the
+        fitted vocabulary that a full retrain is worthwhile
+        """
+        stats = self.vocabulary_stats
+        if stats is None:
+            return False
+        
+        changed = stats['added_movies'] + stats['removed_movies']
+        if changed > REFIT_CHANGE_FRACTION * stats['base_movies']:
+            return True
+        
+        if stats['added_tokens']:
+            added_oov_rate = stats['added_oov_tokens'] / stats['added_tokens']
+            return added_oov_rate - stats['base_oov_rate'] > REFIT_OOV_INCREASE
+        return False
+    
+    def build_ann_index(self, n_lists=ANN_N_LISTS, n_probe=ANN_N_PROBE):
+        """
+        Build the IVF index used to pre-select candidates for vector queries
+        """
+        self.ann_index = IVFIndex(n_lists=n_lists, n_probe=n_probe).fit(self.tfidf_matrix)
+    
+    def get_similarity_scores(self, movie_idx):
+        """
+        Cosine similarity of one movie against the whole catalog
+        """
+        return self.score_vector(self.tfidf_matrix[movie_idx])
+    
+    def search_vector(self, query_vector, top_n, exclude=None, mask=None):
+        """
+        Return (ids, scores) of the top_n catalog matches for a query vector,
+        considering only movies where the boolean mask is True, if given
+
+        With an ANN index only its candidates are scored; if they cannot
+        fill top_n the whole catalog is scored instead.
+        """
+        if self.ann_index is not None:
+            candidates = self.ann_index.candidates(query_vector)
+            if exclude is not None:
+                candidates = candidates[~np.isin(candidates, exclude)]
+            if mask is not None:
+                candidates = candidates[mask[candidates]]
+            
+            if len(candidates) >= top_n:
+                top, top_scores = select_top_n(self.score_vector(query_vector, candidates), top_n)
+                return candidates[top], top_scores
+        
+        scores = self.score_vector(query_vector)
+        if mask is not None:
+            # Filtered-out movies can never be selected
+            scores[~mask] = -np.inf
+        return select_top_n(scores, top_n, exclude=exclude)
+    
+    def resolve_title(self, movie_title):
+        """
+        Row id for a title: exact match, then partial match, then closest fuzzy match
+        """
+        movie_idx = self.title_index.resolve(movie_title)
+        if movie_idx is None:
+            matches = self.title_search.search(
+                movie_title, limit=1, min_score=FUZZY_MATCH_THRESHOLD
+            )
+            if matches:
+                movie_idx = matches[0][2]
+        return movie_idx
+    
+    def suggest_titles(self, text, limit=TITLE_SUGGESTIONS):
+        """
+        Typeahead title suggestions for partially typed or misspelled input
+        """
+        return self.title_search.suggest(text, limit)
+    
+    def get_recommendations(self, movie_title, top_n=5, genre=None, year_range=None, min_rating=None):
+        """
+        Get movie recommendations based on title, optionally only movies of
+        a genre, within a year range or with a minimum rating
+        """
+        try:
+            # Find the movie index
+            movie_idx = self.resolve_title(movie_title)
+            
+            if movie_idx is None:
+                return None, "Movie not found in database"
+            
+            mask = self.movies.filter_mask(genre, year_range, min_rating)
+            
+            top_ids = None
+            if self.neighbor_ids is not None and top_n <= self.neighbor_ids.shape[1]:
+                # Serve straight from the precomputed neighbor table
+                top_ids = np.asarray(self.neighbor_ids[movie_idx])
+                top_scores = np.asarray(self.neighbor_scores[movie_idx])
+                # Unfilled slots (-1) occur when the catalog has K or fewer other movies
+                keep = top_ids >= 0
+                if mask is not None:
+                    keep[keep] = mask[top_ids[keep]]
+                top_ids, top_scores = top_ids[keep], top_scores[keep]
+                
+                # Too few neighbors pass the filters: score the catalog instead
+                if mask is not None and len(top_ids) < top_n and self.tfidf_matrix is not None:
+                    top_ids = None
+                else:
+                    top_ids, top_scores = top_ids[:top_n], top_scores[:top_n]
+            
+            if top_ids is None:
+                if self.tfidf_matrix is None:
+                    return None, "Requested more recommendations than the neighbor table holds"
+                
+                # Get top N recommendations (excluding the movie itself)
+                top_ids, top_scores = self.search_vector(
+                    self.tfidf_matrix[movie_idx], top_n, exclude=movie_idx, mask=mask
+                )
+            
+            return self.format_recommendations(top_ids, top_scores), None
+            
+        except Exception as e:
+            return None, f"Error getting recommendations: {str(e)}"
+    
+    def get_recommendations_batch(self, movie_titles, top_n=5, chunk_size=SIMILARITY_BLOCK_SIZE):
+        """
+        Get recommendations for many titles at once
+
+        Titles are resolved up front and scored chunk_size at a time as one
+        sparse matrix-matrix product per chunk. Returns a RecommendationBatch
+        holding the ids and scores as arrays.
+        """
+        try:
+            seed_ids = np.array([
+                -1 if movie_idx is None else movie_idx
+                for movie_idx in map(self.resolve_title, movie_titles)
+            ], dtype=np.int64)
+            
+            ids = np.full((len(seed_ids), top_n), -1, dtype=np.int32)
+            scores = np.full((len(seed_ids), top_n), -np.inf, dtype=np.float32)
+            resolved = np.flatnonzero(seed_ids >= 0)
+            
+            if self.neighbor_ids is not None and top_n <= self.neighbor_ids.shape[1]:
+                ids[resolved] = self.neighbor_ids[seed_ids[resolved], :top_n]
+                scores[resolved] = self.neighbor_scores[seed_ids[resolved], :top_n]
+            elif self.tfidf_matrix is not None:
+                for start in range(0, len(resolved), chunk_size):
+                    rows = resolved[start:start + chunk_size]
+                    seeds = seed_ids[rows]
+                    block = self.score_rows(seeds)
+                    block[np.arange(len(seeds)), seeds] = -np.inf
+                    ids[rows], scores[rows] = select_top_n_rows(block, top_n)
+            else:
+                return None, "Requested more recommendations than the neighbor table holds"
+            
+            return RecommendationBatch(self, movie_titles, seed_ids, ids, scores), None
+            
+        except Exception as e:
+            return None, f"Error getting recommendations: {str(e)}"
+    
+    def recommend_for_profile(self, movie_titles, weights=None, top_n=5, genre=None,
+                              year_range=None, min_rating=None):
+        """
+        Get recommendations for a set of seed titles, e.g. a watchlist
+
+        The seeds' TF-IDF rows are averaged (weighted, if weights are given)
+        into one profile vector, which is scored against the catalog with a
+        single sparse product. The seed movies themselves are excluded.
+        Filters work as in get_recommendations.
+        """
+        try:
+            if self.tfidf_matrix is None:
+                return None, "Profile recommendations need the TF-IDF matrix"
+            
+            if weights is None:
+                weights = [1.0] * len(movie_titles)
+            if len(weights) != len(movie_titles):
+                return None, "Expected one weight per movie title"
+            if any(weight < 0 for weight in weights):
+                return None, "Weights must not be negative"
+            
+            seed_ids = []
+            seed_weights = []
+            for movie_title, weight in zip(movie_titles, weights):
+                movie_idx = self.resolve_title(movie_title)
+                if movie_idx is not None and movie_idx not in seed_ids:
+                    seed_ids.append(movie_idx)
+                    seed_weights.append(weight)
+            
+            if not seed_ids:
+                return None, "None of the movies were found in database"
+            if sum(seed_weights) == 0:
+                return None, "At least one found movie needs a positive weight"
+            
+            # Weighted sum of the seed rows; normalising it for cosine
+            # scoring makes it the same profile as the weighted mean
+            seed_weights = sparse.csr_matrix(seed_weights, dtype=np.float64)
+            profile = normalize(seed_weights @ self.tfidf_matrix[seed_ids])
+            
+            mask = self.movies.filter_mask(genre, year_range, min_rating)
+            top_ids, top_scores = self.search_vector(profile, top_n, exclude=seed_ids, mask=mask)
+            return self.format_recommendations(top_ids, top_scores), None
+            
+        except Exception as e:
+            return None, f"Error getting recommendations: {str(e)}"
+    
+    def recommend_from_text(self, query, top_n=5, genre=None, year_range=None, min_rating=None):
+        """
+        Get recommendations for a free-text description, e.g. "heist movie with dreams"
+
+        The query is cleaned exactly like the training text and embedded
+        with the fitted vectorizer, then scored like any other query vector.
+        Filters work as in get_recommendations.
+        """
+        try:
+            if self.tfidf_matrix is None:
+                return None, "Text search needs the TF-IDF matrix"
+            
+            query_vector = self.tfidf_vectorizer.transform([clean_text(query)])
+            if query_vector.nnz == 0:
+                return None, "None of the query words are known to the model"
+            
+            mask = self.movies.filter_mask(genre, year_range, min_rating)
+            top_ids, top_scores = self.search_vector(query_vector, top_n, mask=mask)
+            return self.format_recommendations(top_ids, top_scores), None
+            
+        except Exception as e:
+            return None, f"Error getting recommendations: {str(e)}"
+    
+    def format_recommendations(self, movie_ids, scores):
+        """
+        Build recommendation dicts for the given movie ids and scores
+        """
+        # Gather movie information for all ids at once, column by column
+        recommendations = self.movies.records(movie_ids)
+        for movie_info, score in zip(recommendations, np.asarray(scores).tolist()):
+            movie_info['similarity_score'] = round(score, 3)
+        
+        return recommendations
+    
+    def save_model(self, path=MODEL_DIR):
+        """
+        Save the trained model as an artifact directory
+
+        Numeric arrays (the CSR parts of the TF-IDF matrix, neighbor table,
+        embeddings and ANN index) are raw .npy files that load_model
+        memory-maps. A manifest.json with a format version names the files
+        of the current version.
+        """
+        try:
+            writer = ArtifactWriter(path)
+            
+            if isinstance(self.tfidf_vectorizer, HashedTfidfVectorizer):
+                # No vocabulary: the kept hash buckets and their IDF weights
+                writer.write_json('vectorizer', {
+                    'type': 'hashing',
+                    'params': self.tfidf_vectorizer.get_params()
+                })
+                writer.write_array('tfidf_feature_ids', self.tfidf_vectorizer.feature_ids_)
+            else:
+                params = self.tfidf_vectorizer.get_params()
+                writer.write_json('vectorizer', {
+                    'type': 'tfidf',
+                    'params': {name: params[name] for name in VECTORIZER_PARAMS},
+                    'vocabulary': {term: int(i) for term, i in self.tfidf_vectorizer.vocabulary_.items()}
+                })
+            writer.write_array('tfidf_idf', self.tfidf_vectorizer.idf_)
+            
+            if self.tfidf_matrix is not None:
+                writer.write_array('tfidf_data', self.tfidf_matrix.data)
+                writer.write_array('tfidf_indices', self.tfidf_matrix.indices)
+                writer.write_array('tfidf_indptr', self.tfidf_matrix.indptr)
+            
+            for name in MODEL_ARRAYS:
+                if getattr(self, name) is not None:
+                    writer.write_array(name, getattr(self, name))
+            
+            if self.ann_index is not None:
+                for name in IVFIndex.ARRAYS:
+                    writer.write_array(f'ann_{name}', getattr(self.ann_index, name))
+            
+            for name, array in self.movies.to_arrays().items():
+                writer.write_array(f'movies_{name}', array)
+            
+            for name, array in self.title_index.to_arrays().items():
+                writer.write_array(f'title_index_{name}', array)
+            for name, array in self.title_search.to_arrays().items():
+                writer.write_array(f'title_search_{name}', array)
+            
+            writer.finish({
+                'n_movies': len(self.movies),
+                'tfidf_shape': list(self.tfidf_matrix.shape) if self.tfidf_matrix is not None else None,
+                'ann_params': self.ann_index.get_params() if self.ann_index is not None else None,
+                'title_ngram_size': self.title_index.ngram_size,
+                'vocabulary_stats': self.vocabulary_stats
+            })
+            
+            print(f"Model saved as {path}")
+            return True
+            
+        except Exception as e:
+            print(f"Error saving model: {str(e)}")
+            return False
+    
+    def load_model(self, path=MODEL_DIR):
+        """
+        Load a pre-trained model from an artifact directory or a legacy pickle
+        """
+        try:
+            if is_artifact(path):
+                self.load_artifact(ArtifactReader(path))
+            else:
+                self.load_pickle(path)
+            
+            print(f"Model loaded from {path}")
+            return True
+            
+        except Exception as e:
+            print(f"Error loading model: {str(e)}")
+            return False
+    
+    def load_artifact(self, reader):
+        """
+        Load a model artifact, memory-mapping its arrays
+        """
+        vectorizer = reader.read_json('vectorizer')
+        params = dict(vectorizer['params'], ngram_range=tuple(vectorizer['params']['ngram_range']))
+        if vectorizer['type'] == 'hashing':
+            self.tfidf_vectorizer = HashedTfidfVectorizer(**params)
+            self.tfidf_vectorizer.feature_ids_ = reader.read_array('tfidf_feature_ids')
+        else:
+            self.tfidf_vectorizer = TfidfVectorizer(**params, vocabulary=vectorizer['vocabulary'])
+        self.tfidf_vectorizer.idf_ = reader.read_array('tfidf_idf')
+        
+        self.tfidf_matrix = None
+        if 'tfidf_data' in reader:
+            self.tfidf_matrix = sparse.csr_matrix(
+                (
+                    reader.read_array('tfidf_data'),
+                    reader.read_array('tfidf_indices'),
+                    reader.read_array('tfidf_indptr')
+                ),
+                shape=tuple(reader.manifest['tfidf_shape'])
+            )
+        
+        for name in MODEL_ARRAYS:
+            setattr(self, name, reader.read_array(name))
+        
+        self.ann_index = None
+        if reader.manifest.get('ann_params') is not None:
+            self.ann_index = IVFIndex(**reader.manifest['ann_params'])
+            for name in IVFIndex.ARRAYS:
+                setattr(self.ann_index, name, reader.read_array(f'ann_{name}'))
+        
+        self.movies = MovieStore.from_arrays({
+            name: reader.read_array(f'movies_{name}') for name in MovieStore.ARRAYS
+        })
+        
+        self.title_index = TitleIndex.from_arrays(
+            {name: reader.read_array(f'title_index_{name}') for name in TitleIndex.ARRAYS},
+            reader.manifest['title_ngram_size']
+        )
+        self.title_search = TitleSearchEngine.from_arrays(
+            {name: reader.read_array(f'title_search_{name}') for name in TitleSearchEngine.ARRAYS},
+            self.movies.title,
+            self.title_index
+        )
+        self.model_version = reader.manifest['model_version']
+        self.vocabulary_stats = reader.manifest.get('vocabulary_stats')
+    
+    def load_pickle(self, filename):
+        """
+        Load a model saved as a single pickle by earlier versions
+
+        Those pickles hold the vectorizer, the TF-IDF matrix, the movies
+        DataFrame and a dense 'similarity_matrix', which is no longer needed
+        and is dropped here rather than kept in memory.
+        """
+        with open(filename, 'rb') as f:
+            model_data = pickle.load(f)
+        
+        self.tfidf_vectorizer = model_data['tfidf_vectorizer']
+        self.tfidf_matrix = model_data['tfidf_matrix'].tocsr()
+        self.neighbor_ids = None
+        self.neighbor_scores = None
+        self.ann_index = None
+        self.svd_components = None
+        self.embeddings = None
+        self.movies = MovieStore.from_frame(model_data['movies_df'].reset_index(drop=True))
+        
+        self.build_title_lookups()
+        self.model_version = None
+        self.vocabulary_stats = None
+    
+    def resolve_tmdb_ids(self, tmdb):
+        """
+        Look up the TMDB id of every movie that has none and store it with
+        the movie, so the apps can go straight to /movie/{id} endpoints
+
+        Returns the number of ids found.
+        """
+        tmdb_id = np.array(self.movies.tmdb_id)
+        missing = np.flatnonzero(tmdb_id == MISSING_TMDB_ID)
+        titles = self.movies.title.gather(missing)
+        years = np.asarray(self.movies.year)[missing].tolist()
+        
+        for idx, title, year in zip(missing, titles, years):
+            tmdb_id[idx] = tmdb.resolve_id(title, year) or MISSING_TMDB_ID
+        
+        self.movies.tmdb_id = tmdb_id
+        return int((tmdb_id[missing] != MISSING_TMDB_ID).sum())
+    
+    def memory_usage(self):
+        """
+        Bytes held by the model, split into private heap and memory-mapped files
+        """
+        arrays = [getattr(self, name) for name in MODEL_ARRAYS]
+        if self.tfidf_matrix is not None:
+            arrays += [self.tfidf_matrix.data, self.tfidf_matrix.indices, self.tfidf_matrix.indptr]
+        if self.ann_index is not None:
+            arrays += [getattr(self.ann_index, name) for name in IVFIndex.ARRAYS]
+        
+        if self.movies is not None:
+            arrays += list(self.movies.to_arrays().values())
+        
+        usage = {'heap_bytes': 0, 'mapped_bytes': 0}
+        for array in arrays:
+            if array is None:
+                continue
+            usage['mapped_bytes' if is_memory_mapped(array) else 'heap_bytes'] += array.nbytes
+        return usage
+    
+    def get_movie_list(self):
+        """
+        Get list of all movies in the dataset
+        """
+        if self.movies is not None:
+            return self.movies.titles()
+        return []
+
+def train_model(csv_file='sample_movies.csv', model_file=MODEL_DIR, top_k=NEIGHBOR_TOP_K,
+                ann=False, embedding_dim=None, workers=1, features='tfidf', tmdb_ids=False,
+                enrich=False, n_probe=ANN_N_PROBE):
+    """
+    Train and save the movie recommendation model, using workers processes
+    (0 = every core) for the parallel build steps and the given feature
+    mode ('tfidf' or 'hashing'). With ann set, the ANN index visits
+    n_probe lists per query and its recall is reported. With tmdb_ids
+    set, movies are also resolved to TMDB ids, and with enrich set their
+    TMDB metadata is fetched into the enrichment table, if the TMDB API
+    is configured.
+    """
+    workers = resolve_workers(workers)
+    recommender = MovieRecommender(features=features)
+    
+    # Load and preprocess data
+    if not recommender.preprocess_data(csv_file):
+        return False
+    
+    # Build model
+    if not recommender.build_model(top_k=top_k, ann=ann, embedding_dim=embedding_dim, workers=workers,
+                                   n_probe=n_probe):
+        return False
+    
+    if ann:
+        report = recommender.ann_report()
+        print(
+            f"ANN index: recall@{report['k']} {report['recall']:.1%} at n_probe={report['n_probe']}; "
+            f"{report['ann_ms']:.3f} ms/query vs {report['exact_ms']:.3f} ms exact"
+        )
+    
+    if features == 'hashing':
+        report = recommender.feature_report()
+        print(
+            f"Hashed features: {report['overlap']:.1%} top-10 overlap with TF-IDF; "
+            f"vectorizer state {report['hashed_bytes'] / 1e3:.1f} kB vs {report['tfidf_bytes'] / 1e3:.1f} kB"
+        )
+    
+    if embedding_dim:
+        report = recommender.scoring_report()
+        print(
+            f"Sparse scoring: {report['sparse_bytes'] / 1e6:.1f} MB, {report['sparse_ms']:.3f} ms/query; "
+            f"dense embeddings: {report['dense_bytes'] / 1e6:.1f} MB, {report['dense_ms']:.3f} ms/query"
+        )
+    
+    if tmdb_ids:
+        tmdb = TMDBIntegration()
+        if tmdb.is_api_configured():
+            found = recommender.resolve_tmdb_ids(tmdb)
+            print(f"Resolved {found} movies to TMDB ids")
+        else:
+            print("TMDB API not configured; skipping TMDB id lookup")
+    
+    # Save model
+    if not recommender.save_model(model_file):
+        return False
+    
+    if enrich:
+        counts = enrich_catalog(recommender.movies, enrichment_file_for(model_file))
+        if counts is not None:
+            print(f"TMDB enrichment: {counts['enriched']} enriched, {counts['not_found']} not found, {counts['failed']} failed")
+    
+    return True
+
+def update_model(csv_file, model_file=MODEL_DIR):
+    """
+    Add the movies in csv_file to a saved model and save it as a new version
+    """
+    recommender = MovieRecommender()
+    if not recommender.load_model(model_file):
+        return False
+    
+    if not recommender.add_movies(pd.read_csv(csv_file)):
+        return False
+    
+    if recommender.needs_refit():
+        print("Vocabulary has drifted since the last full training; retrain with train_model()")
+    
+    return recommender.save_model(model_file)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the movie recommendation model")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes for cleaning and neighbor computation (0 = every core)")
+    parser.add_argument('--features', choices=('tfidf', 'hashing'), default='tfidf',
+                        help="text features: TF-IDF vocabulary or vocabulary-free feature hashing")
+    parser.add_argument('--embedding-dim', type=int, nargs='?', const=EMBEDDING_DIM,
+                        help=f"score with dense SVD embeddings of this size (default {EMBEDDING_DIM}) "
+                             "and report their memory and latency against sparse scoring")
+    parser.add_argument('--ann', action='store_true',
+                        help="build the approximate nearest-neighbour index and report its recall")
+    parser.add_argument('--n-probe', type=int, default=ANN_N_PROBE,
+                        help="IVF lists the ANN index visits per query: higher = better recall, slower")
+    parser.add_argument('--tmdb-ids', action='store_true',
+                        help="resolve every movie to its TMDB id (needs TMDB_API_KEY)")
+    parser.add_argument('--enrich', action='store_true',
+                        help="fetch TMDB metadata for every movie so the app serves it locally (needs TMDB_API_KEY)")
+    args = parser.parse_args()
+    
+    # Train the model
+    success = train_model(workers=args.workers, features=args.features, tmdb_ids=args.tmdb_ids,
+                          enrich=args.enrich, ann=args.ann, n_probe=args.n_probe,
+                          embedding_dim=args.embedding_dim)
+    if success:
+        print("Model training completed successfully!")
+    else:
+        print("Model training failed!")
@@ -0,0 +1,314 @@
+import numpy as np
+import pandas as pd
+
+# Stored year of movies whose year is unknown
+MISSING_YEAR = 0
+
+# Stored TMDB id of movies not resolved to one
+MISSING_TMDB_ID = 0
+
+class StringColumn:
+    """
+    Strings stored as one UTF-8 blob plus an offsets array
+
+    String i is blob[offsets[i]:offsets[i + 1]]. Both arrays can be
+    memory-mapped, so a column costs no per-string Python objects until
+    a row is read.
+    """
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    @classmethod
+    def from_strings(cls, values):
+        encoded = [str(value).encode('utf-8') for value in values]
+        lengths = np.fromiter((len(value) for value in encoded), dtype=np.int64, count=len(encoded))
+        offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(offsets, blob)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def gather(self, ids):
+        """
+        Strings for an array of row ids
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        starts = self.offsets[ids].tolist()
+        stops = self.offsets[ids + 1].tolist()
+        blob = self.blob
+        return [blob[start:stop].tobytes().decode('utf-8') for start, stop in zip(starts, stops)]
+
+    def tolist(self):
+        return self.gather(np.arange(len(self)))
+
+    def take(self, ids):
+        """
+        New column with the rows ids, copied in one vectorised pass
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        starts = self.offsets[ids]
+        lengths = self.offsets[ids + 1] - starts
+        offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return StringColumn(offsets, np.asarray(self.blob)[positions])
+
+    def append(self, other):
+        offsets = np.concatenate((self.offsets, other.offsets[1:] + self.offsets[-1]))
+        return StringColumn(offsets, np.concatenate((self.blob, other.blob)))
+
+def genre_code_dtype(n_genres):
+    """
+    Smallest signed integer type that can hold every genre code and -1 (missing)
+    """
+    return np.int16 if n_genres < np.iinfo(np.int16).max else np.int32
+
+class MovieStore:
+    """
+    Compact, columnar movie metadata keyed by row id
+
+    Titles and overviews are StringColumns, genres are codes into a list
+    of distinct genre names, ratings are float32 (NaN when unknown) and
+    years int16 (MISSING_YEAR when unknown) and TMDB ids int32
+    (MISSING_TMDB_ID until resolved). Every column is a NumPy
+    array, so a saved store is memory-mapped like the rest of the model
+    and results for a batch of ids are gathered column by column.
+
+    filter_mask() turns genre, year and rating filters into a boolean mask
+    over row ids. Genre masks are built once per genre word and reused.
+    """
+    # Stored arrays, see to_arrays()
+    ARRAYS = (
+        'title_offsets', 'title_blob', 'overview_offsets', 'overview_blob',
+        'genre_codes', 'genre_names_offsets', 'genre_names_blob', 'rating', 'year', 'tmdb_id'
+    )
+
+    def __init__(self, title, overview, genre_codes, genre_names, rating, year, tmdb_id=None):
+        self.title = title
+        self.overview = overview
+        self.genre_codes = genre_codes
+        self.genre_names = genre_names
+        self.rating = rating
+        self.year = year
+        if tmdb_id is None:
+            tmdb_id = np.full(len(title), MISSING_TMDB_ID, dtype=np.int32)
+        self.tmdb_id = tmdb_id
+        self._genre_masks = {}
+
+    @classmethod
+    def from_frame(cls, movies_df):
+        """
+        Build a store from a DataFrame with title and overview columns and
+        optional genre, rating, year and tmdb_id columns
+        """
+        n_movies = len(movies_df)
+        if 'genre' in movies_df:
+            genres = movies_df['genre'].astype('category').cat
+            genre_names = [str(name) for name in genres.categories]
+            genre_codes = genres.codes.to_numpy().astype(genre_code_dtype(len(genre_names)))
+        else:
+            genre_names = []
+            genre_codes = np.full(n_movies, -1, dtype=np.int16)
+
+        rating = np.full(n_movies, np.nan, dtype=np.float32)
+        if 'rating' in movies_df:
+            rating[:] = pd.to_numeric(movies_df['rating'], errors='coerce').to_numpy(dtype=np.float32, na_value=np.nan)
+
+        year = np.full(n_movies, MISSING_YEAR, dtype=np.int16)
+        if 'year' in movies_df:
+            years = pd.to_numeric(movies_df['year'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            known = ~np.isnan(years)
+            year[known] = years[known].round()
+
+        tmdb_id = np.full(n_movies, MISSING_TMDB_ID, dtype=np.int32)
+        if 'tmdb_id' in movies_df:
+            ids = pd.to_numeric(movies_df['tmdb_id'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            known = ~np.isnan(ids)
+            tmdb_id[known] = ids[known]
+
+        return cls(
+            StringColumn.from_strings(movies_df['title']),
+            StringColumn.from_strings(movies_df['overview']),
+            genre_codes,
+            StringColumn.from_strings(genre_names),
+            rating,
+            year,
+            tmdb_id
+        )
+
+    def to_arrays(self):
+        """
+        Every column as a named array, for saving
+        """
+        return {
+            'title_offsets': self.title.offsets,
+            'title_blob': self.title.blob,
+            'overview_offsets': self.overview.offsets,
+            'overview_blob': self.overview.blob,
+            'genre_codes': self.genre_codes,
+            'genre_names_offsets': self.genre_names.offsets,
+            'genre_names_blob': self.genre_names.blob,
+            'rating': self.rating,
+            'year': self.year,
+            'tmdb_id': self.tmdb_id
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(
+            StringColumn(arrays['title_offsets'], arrays['title_blob']),
+            StringColumn(arrays['overview_offsets'], arrays['overview_blob']),
+            arrays['genre_codes'],
+            StringColumn(arrays['genre_names_offsets'], arrays['genre_names_blob']),
+            arrays['rating'],
+            arrays['year'],
+            arrays['tmdb_id']
+        )
+
+    def __len__(self):
+        return len(self.title)
+
+    def titles(self):
+        return self.title.tolist()
+
+    def genres(self, ids):
+        """
+        Genre names for an array of row ids, '' where unknown
+        """
+        names = self.genre_names.tolist() + ['']
+        return [names[code] for code in np.asarray(self.genre_codes)[ids].tolist()]
+
+    def genre_words(self):
+        """
+        Sorted distinct words of the genre names, e.g. 'Action', 'Drama'
+        """
+        return sorted({word for name in self.genre_names.tolist() for word in name.split()})
+
+    def genre_mask(self, genre):
+        """
+        Boolean mask of the movies whose genre includes the word genre, any case
+        """
+        word = genre.strip().casefold()
+        if word not in self._genre_masks:
+            # Decide per distinct genre name, then expand over the codes
+            matches = [word in name.casefold().split() for name in self.genre_names.tolist()]
+            self._genre_masks[word] = np.array(matches + [False], dtype=bool)[np.asarray(self.genre_codes)]
+        return self._genre_masks[word]
+
+    def filter_mask(self, genre=None, year_range=None, min_rating=None):
+        """
+        Boolean mask of the movies passing every given filter, or None if none is given
+
+        genre is one genre word or a list of them (any may match),
+        year_range an inclusive (first, last) pair where either end may be
+        None, and min_rating the lowest rating accepted. Movies with an
+        unknown year or rating fail those filters.
+        """
+        mask = None
+
+        if genre:
+            genres = [genre] if isinstance(genre, str) else genre
+            mask = np.logical_or.reduce([self.genre_mask(word) for word in genres])
+
+        if year_range is not None:
+            first, last = year_range
+            year = np.asarray(self.year)
+            year_mask = year != MISSING_YEAR
+            if first is not None:
+                year_mask &= year >= first
+            if last is not None:
+                year_mask &= year <= last
+            mask = year_mask if mask is None else mask & year_mask
+
+        if min_rating is not None:
+            rating_mask = np.asarray(self.rating) >= min_rating
+            mask = rating_mask if mask is None else mask & rating_mask
+
+        return mask
+
+    def text_frame(self, ids):
+        """
+        DataFrame of the title, genre and overview text for row ids
+        """
+        return pd.DataFrame({
+            'title': self.title.gather(ids),
+            'genre': self.genres(ids),
+            'overview': self.overview.gather(ids)
+        })
+
+    def records(self, ids):
+        """
+        One dict of title, genre, overview, rating, year and tmdb_id per
+        row id, gathered column by column; unknown ratings and years are
+        'N/A' and unknown TMDB ids None
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        ratings = [
+            # Shortest float32 repr, so a stored 8.8 comes back as 8.8
+            'N/A' if np.isnan(rating) else float(str(rating))
+            for rating in np.asarray(self.rating)[ids]
+        ]
+        years = [
+            'N/A' if year == MISSING_YEAR else year
+            for year in np.asarray(self.year)[ids].tolist()
+        ]
+        tmdb_ids = [
+            None if tmdb_id == MISSING_TMDB_ID else tmdb_id
+            for tmdb_id in np.asarray(self.tmdb_id)[ids].tolist()
+        ]
+        return [
+            {
+                'title': title, 'genre': genre, 'overview': overview, 'rating': rating, 'year': year,
+                'tmdb_id': tmdb_id
+            }
+            for title, genre, overview, rating, year, tmdb_id in zip(
+                self.title.gather(ids), self.genres(ids), self.overview.gather(ids), ratings, years,
+                tmdb_ids
+            )
+        ]
+
+    def take(self, ids):
+        """
+        New store with the rows ids, renumbered from 0
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        return MovieStore(
+            self.title.take(ids),
+            self.overview.take(ids),
+            np.asarray(self.genre_codes)[ids],
+            self.genre_names,
+            np.asarray(self.rating)[ids],
+            np.asarray(self.year)[ids],
+            np.asarray(self.tmdb_id)[ids]
+        )
+
+    def append(self, other):
+        """
+        New store with the rows of other after these, merging genre names
+        """
+        names = self.genre_names.tolist()
+        lookup = {name: code for code, name in enumerate(names)}
+        for name in other.genre_names.tolist():
+            if name not in lookup:
+                lookup[name] = len(names)
+                names.append(name)
+        remap = np.array([lookup[name] for name in other.genre_names.tolist()] + [-1], dtype=np.int64)
+
+        dtype = genre_code_dtype(len(names))
+        genre_codes = np.concatenate((
+            np.asarray(self.genre_codes).astype(dtype),
+            remap[np.asarray(other.genre_codes)].astype(dtype)
+        ))
+        return MovieStore(
+            self.title.append(other.title),
+            self.overview.append(other.overview),
+            genre_codes,
+            StringColumn.from_strings(names),
+            np.concatenate((self.rating, other.rating)),
+            np.concatenate((self.year, other.year)),
+            np.concatenate((self.tmdb_id, other.tmdb_id))
+        )
@@ -0,0 +1,108 @@
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+def resolve_workers(workers):
+    """
+    Number of worker processes to use; 0 or None means one per CPU core
+    """
+    return workers or os.cpu_count() or 1
+
+def ordered_map(function, items, workers, window=None):
+    """
+    Yield function(item) for every item, computed in a process pool, in input order
+
+    At most window items (default 2 x workers) are in flight, so a long
+    input is never pickled to the workers all at once.
+    """
+    window = window or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+# Per-process state of a neighbor worker, set by _init_neighbor_worker
+_worker = {}
+
+def _init_neighbor_worker(directory, matrix_shape, block_function):
+    """
+    Memory-map the inputs and output tables shared through directory
+    """
+    def load(name, mode='r'):
+        filename = os.path.join(directory, f"{name}.npy")
+        return np.load(filename, mmap_mode=mode) if os.path.exists(filename) else None
+
+    tfidf_matrix = None
+    if load('tfidf_data') is not None:
+        tfidf_matrix = sparse.csr_matrix(
+            (load('tfidf_data'), load('tfidf_indices'), load('tfidf_indptr')), shape=matrix_shape
+        )
+    _worker.update(
+        tfidf_matrix=tfidf_matrix,
+        embeddings=load('embeddings'),
+        neighbor_ids=load('neighbor_ids', 'r+'),
+        neighbor_scores=load('neighbor_scores', 'r+'),
+        block_function=block_function
+    )
+
+def _neighbor_task(start, stop, top_k):
+    ids, scores = _worker['block_function'](
+        _worker['tfidf_matrix'], _worker['embeddings'], start, stop, top_k
+    )
+    _worker['neighbor_ids'][start:stop] = ids
+    _worker['neighbor_scores'][start:stop] = scores
+
+def parallel_neighbors(block_function, tfidf_matrix, embeddings, top_k, block_size, workers):
+    """
+    Compute a neighbor table with block_function(tfidf_matrix, embeddings,
+    start, stop, top_k) spread over a process pool
+
+    The inputs and the N x top_k output tables are memory-mapped .npy files
+    in a temporary directory, so every worker shares one copy through the
+    page cache and writes its blocks straight into the result. Blocks have
+    the same boundaries as a serial build, so the result is identical.
+    """
+    n_movies = tfidf_matrix.shape[0]
+    with tempfile.TemporaryDirectory(prefix='neighbors-') as directory:
+        def path(name):
+            return os.path.join(directory, f"{name}.npy")
+
+        if embeddings is not None:
+            np.save(path('embeddings'), np.ascontiguousarray(embeddings))
+        else:
+            np.save(path('tfidf_data'), tfidf_matrix.data)
+            np.save(path('tfidf_indices'), tfidf_matrix.indices)
+            np.save(path('tfidf_indptr'), tfidf_matrix.indptr)
+        neighbor_ids = np.lib.format.open_memmap(
+            path('neighbor_ids'), mode='w+', dtype=np.int32, shape=(n_movies, top_k)
+        )
+        neighbor_scores = np.lib.format.open_memmap(
+            path('neighbor_scores'), mode='w+', dtype=np.float32, shape=(n_movies, top_k)
+        )
+        neighbor_ids.flush()
+        neighbor_scores.flush()
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_neighbor_worker,
+            initargs=(directory, tfidf_matrix.shape, block_function)
+        ) as executor:
+            futures = [
+                executor.submit(_neighbor_task, start, min(start + block_size, n_movies), top_k)
+                for start in range(0, n_movies, block_size)
+            ]
+            for future in futures:
+                future.result()
+
+        # Copy out before the temporary files are deleted
+        result = np.array(neighbor_ids), np.array(neighbor_scores)
+        del neighbor_ids, neighbor_scores
+        return result
@@ -0,0 +1,126 @@
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from title_index import normalize_title
+
+class ResultCache:
+    """
+    Bounded in-process cache of recommendation results
+
+    Entries are evicted least-recently-used once max_entries is reached
+    and expire ttl seconds after they were stored. Keys include the model
+    version, so results of an old model are never served after a reload;
+    invalidate() additionally drops them to free the memory.
+
+    With disk_path set, results are also written to a SQLite file and
+    looked up there on an in-memory miss, so warm results survive a
+    process restart and are shared by processes on one host.
+    """
+    def __init__(self, max_entries=1024, ttl=3600, disk_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._disk = None
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._disk = sqlite3.connect(disk_path, timeout=10, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, model_version TEXT, expires_at REAL, value TEXT)"
+            )
+            self._disk.commit()
+
+    @staticmethod
+    def make_key(title, top_n, filters, model_version):
+        """
+        Cache key for a request; titles differing only in case or spacing share a key
+        """
+        return json.dumps(
+            [normalize_title(title), top_n, sorted((filters or {}).items()), model_version],
+            default=list
+        )
+
+    def get(self, key):
+        """
+        Cached value for key, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            if entry is not None:
+                del self.entries[key]
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT expires_at, value FROM results WHERE key = ? AND expires_at > ?",
+                    (key, now)
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[1])
+                    self._store(key, value, row[0])
+                    self.disk_hits += 1
+                    return copy.deepcopy(value)
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value, model_version=None):
+        """
+        Store a JSON-serialisable value under key
+        """
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store(key, copy.deepcopy(value), expires_at)
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                    (key, model_version, expires_at, json.dumps(value))
+                )
+                self._disk.commit()
+
+    def _store(self, key, value, expires_at):
+        self.entries[key] = (expires_at, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, model_version=None):
+        """
+        Drop every in-memory entry, and disk entries of any other model version
+        """
+        with self._lock:
+            self.entries.clear()
+            if self._disk is not None:
+                self._disk.execute(
+                    "DELETE FROM results WHERE model_version IS NOT ? OR expires_at <= ?",
+                    (model_version, time.time())
+                )
+                self._disk.commit()
+
+    def stats(self):
+        """
+        Hit/miss counters and current size
+        """
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            'entries': len(self.entries)
+        }
@@ -1,8 +1,8 @@
-@echo off
-echo 🎬 Movie Recommendation System
-echo ================================
-echo.
-echo Starting the application...
-echo.
-python run_app.py
-pause
+@echo off
+echo 🎬 Movie Recommendation System
+echo ================================
+echo.
+echo Starting the application...
+echo.
+python run_app.py
+pause
@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from movie_store import MovieStore
+from tests.tmdb_stub import StubTMDBServer
+from tmdb_enrichment import enrich_catalog
+from tmdb_integration import TMDBIntegration, enrichment_file_for
+
+def stub_client(server, enrichment_file=None):
+    """
+    TMDBIntegration talking to the stand-in server, without a response cache
+    """
+    tmdb = TMDBIntegration(cache_file=None, max_workers=2, enrichment_file=enrichment_file)
+    tmdb.base_url = server.base_url
+    tmdb.api_key = 'test-key'
+    return tmdb
+
+class EnrichmentTest(unittest.TestCase):
+    def setUp(self):
+        self.server = StubTMDBServer().start()
+        self.directory = tempfile.mkdtemp()
+        self.enrichment_file = enrichment_file_for(os.path.join(self.directory, 'model'))
+        self.movies = MovieStore.from_frame(pd.DataFrame({
+            'title': ['Heat', 'Alien', 'Missing Film', 'Broken Film'],
+            'overview': ['heist', 'space', 'lost', 'error'],
+            'year': [1995, 1979, 2001, 2002]
+        }))
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def test_enrichment_counts_and_resume(self):
+        counts = enrich_catalog(self.movies, self.enrichment_file, stub_client(self.server), workers=2, batch_size=2)
+        self.assertEqual(counts, {'enriched': 2, 'not_found': 1, 'failed': 1})
+
+        # Only the failed title is fetched again
+        before = self.server.request_count()
+        counts = enrich_catalog(self.movies, self.enrichment_file, stub_client(self.server), workers=2)
+        self.assertEqual(counts, {'enriched': 0, 'not_found': 0, 'failed': 1})
+        self.assertEqual(self.server.request_count() - before, 1)
+
+    def test_enriched_titles_are_served_without_requests(self):
+        # The client starts before the table exists, as the app may
+        tmdb = stub_client(self.server, self.enrichment_file)
+        self.assertIsNone(tmdb.enriched('Heat', 1995))
+
+        enrich_catalog(self.movies, self.enrichment_file, stub_client(self.server), workers=2)
+        before = self.server.request_count()
+        self.assertIsNotNone(tmdb.get_movie_poster('Heat', 1995))
+        self.assertIsNotNone(tmdb.get_movie_trailer('Alien', 1979))
+        self.assertIsNone(tmdb.get_movie_details('Missing Film', 2001))
+        self.assertEqual(self.server.request_count(), before)
+
+if __name__ == '__main__':
+    unittest.main()
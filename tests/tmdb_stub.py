@@ -0,0 +1,105 @@
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+class StubTMDBServer:
+    """
+    Local stand-in for the TMDB API, for testing without network access
+
+    Answers the endpoints TMDBIntegration uses: /search/movie (one match,
+    whose id is derived from the title, or none if the title contains
+    "Missing") and /movie/<id> with appended videos. Titles containing
+    "Broken" get 400 Bad Request. Every request path is counted in
+    requests, keyed by endpoint.
+    """
+    def __init__(self):
+        self.requests = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/3"
+
+    def request_count(self):
+        with self._lock:
+            return sum(self.requests.values())
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve(self):
+        """
+        Serve in this thread until interrupted
+        """
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            self._server.server_close()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def respond(self, path, query):
+        """
+        (status, JSON body) for a request
+        """
+        if path == '/3/search/movie':
+            title = query.get('query', [''])[0]
+            with self._lock:
+                self.requests['search'] = self.requests.get('search', 0) + 1
+            if 'Broken' in title:
+                return 400, {'status_message': 'Bad request'}
+            if 'Missing' in title:
+                return 200, {'results': []}
+            movie_id = zlib.crc32(title.lower().encode('utf-8')) % 100000 + 1
+            return 200, {'results': [{'id': movie_id, 'title': title}]}
+
+        parts = path.strip('/').split('/')
+        if len(parts) == 3 and parts[1] == 'movie' and parts[2].isdigit():
+            with self._lock:
+                self.requests['movie'] = self.requests.get('movie', 0) + 1
+            movie_id = int(parts[2])
+            return 200, {
+                'id': movie_id,
+                'title': f"Movie {movie_id}",
+                'overview': 'A stand-in movie.',
+                'poster_path': f"/poster{movie_id}.jpg",
+                'release_date': '2000-01-01',
+                'vote_average': 7.5,
+                'runtime': 100,
+                'genres': [{'name': 'Drama'}],
+                'videos': {'results': [{'type': 'Trailer', 'site': 'YouTube', 'key': f"trailer{movie_id}"}]}
+            }
+
+        return 404, {'status_message': 'Not found'}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                status, body = stub.respond(url.path, parse_qs(url.query))
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+if __name__ == "__main__":
+    server = StubTMDBServer()
+    print(f"Stand-in TMDB API at {server.base_url}; press Ctrl+C to stop")
+    server.serve()
@@ -0,0 +1,312 @@
+import re
+import zlib
+
+import numpy as np
+
+from movie_store import StringColumn
+
+_WHITESPACE = re.compile(r'\s+')
+
+def normalize_title(title):
+    """
+    Normalise a title for lookups: case-folded, single-spaced, trimmed
+    """
+    return _WHITESPACE.sub(' ', str(title)).strip().casefold()
+
+def title_ngrams(text, n=3):
+    """
+    Set of character n-grams of a normalised title, padded with spaces
+    """
+    padded = f" {text} "
+    return {padded[i:i + n] for i in range(max(len(padded) - n + 1, 1))}
+
+def title_hash(key):
+    """
+    Stable 32-bit hash of a normalised title, the same in every process
+    """
+    return zlib.crc32(key.encode('utf-8'))
+
+def hash_table(keys, key_hashes):
+    """
+    Open-addressing hash table over normalised titles, at most half full
+
+    Each distinct key's first row id sits at the first free slot from
+    hash & (size - 1); next_ids chains the rows sharing a key in row order.
+    """
+    first = {}
+    last = {}
+    next_ids = [-1] * len(keys)
+    for row_id, key in enumerate(keys):
+        if key in last:
+            next_ids[last[key]] = row_id
+        else:
+            first[key] = row_id
+        last[key] = row_id
+
+    size = 1 << max((2 * len(first) - 1).bit_length(), 3)
+    mask = size - 1
+    slots = [-1] * size
+    for row_id in first.values():
+        pos = int(key_hashes[row_id]) & mask
+        while slots[pos] != -1:
+            pos = (pos + 1) & mask
+        slots[pos] = row_id
+    return np.array(slots, dtype=np.int32), np.array(next_ids, dtype=np.int32)
+
+def build_postings(keys, ngram_size):
+    """
+    Inverted index of keys' n-grams: sorted n-grams, CSR-style offsets and
+    the ascending row ids of each n-gram's titles
+    """
+    postings = {}
+    for row_id, key in enumerate(keys):
+        for gram in title_ngrams(key, ngram_size):
+            postings.setdefault(gram, []).append(row_id)
+
+    grams = sorted(postings)
+    lengths = np.fromiter((len(postings[gram]) for gram in grams), dtype=np.int64, count=len(grams))
+    offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+    ids = np.fromiter(
+        (row_id for gram in grams for row_id in postings[gram]), dtype=np.int32, count=int(offsets[-1])
+    )
+    return np.array(grams, dtype=f'<U{ngram_size}'), offsets, ids
+
+class TitleIndex:
+    """
+    Title -> row id index built once per catalog and saved with the model
+
+    Every part is a NumPy array, so a saved index is memory-mapped and
+    loading it costs no per-title work:
+
+    - keys: the normalised titles in row order, as a StringColumn
+    - slots, next_ids: an open-addressing hash table keyed on
+      title_hash(key), with key_hashes holding each row's hash. Exact
+      lookups probe a few slots, then follow next_ids through the other
+      films sharing the title.
+    - grams, gram_offsets, gram_ids: an inverted index from each character
+      n-gram to the ascending row ids of the titles containing it.
+      Substring lookups intersect the postings of the query's n-grams and
+      check only the surviving candidates with `in`, so the query is never
+      treated as a regex and the catalog is never rescanned.
+    """
+    # Stored arrays, see to_arrays()
+    ARRAYS = ('key_offsets', 'key_blob', 'key_hashes', 'slots', 'next_ids', 'grams', 'gram_offsets', 'gram_ids')
+
+    def __init__(self, keys, key_hashes, slots, next_ids, grams, gram_offsets, gram_ids, ngram_size=3):
+        self.keys = keys
+        self.key_hashes = key_hashes
+        self.slots = slots
+        self.next_ids = next_ids
+        self.grams = grams
+        self.gram_offsets = gram_offsets
+        self.gram_ids = gram_ids
+        self.ngram_size = ngram_size
+
+    @classmethod
+    def build(cls, titles, ngram_size=3):
+        keys = [normalize_title(title) for title in titles]
+        key_hashes = np.fromiter((title_hash(key) for key in keys), dtype=np.uint32, count=len(keys))
+        return cls(
+            StringColumn.from_strings(keys),
+            key_hashes,
+            *hash_table(keys, key_hashes),
+            *build_postings(keys, ngram_size),
+            ngram_size
+        )
+
+    def to_arrays(self):
+        """
+        Every part as a named array, for saving
+        """
+        return {
+            'key_offsets': self.keys.offsets,
+            'key_blob': self.keys.blob,
+            'key_hashes': self.key_hashes,
+            'slots': self.slots,
+            'next_ids': self.next_ids,
+            'grams': self.grams,
+            'gram_offsets': self.gram_offsets,
+            'gram_ids': self.gram_ids
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, ngram_size=3):
+        return cls(
+            StringColumn(arrays['key_offsets'], arrays['key_blob']),
+            arrays['key_hashes'],
+            arrays['slots'],
+            arrays['next_ids'],
+            arrays['grams'],
+            arrays['gram_offsets'],
+            arrays['gram_ids'],
+            ngram_size
+        )
+
+    def __len__(self):
+        return len(self.keys)
+
+    def append(self, titles):
+        """
+        New index with titles added as the next row ids
+        """
+        n_old = len(self)
+        other = TitleIndex.build(titles, self.ngram_size)
+        keys = self.keys.append(other.keys)
+        key_hashes = np.concatenate((self.key_hashes, other.key_hashes))
+        new_keys = np.asarray(other.slots)[np.asarray(other.slots) >= 0] + n_old
+        if 2 * (np.count_nonzero(np.asarray(self.slots) >= 0) + len(new_keys)) > len(self.slots):
+            slots, next_ids = hash_table(keys.tolist(), key_hashes)
+        else:
+            # Copy, as a loaded table is a read-only memory map
+            slots = np.array(self.slots)
+            next_ids = np.concatenate((
+                self.next_ids, np.where(other.next_ids >= 0, other.next_ids + n_old, -1)
+            )).astype(np.int32)
+            mask = len(slots) - 1
+            for row_id in sorted(new_keys.tolist()):
+                key = keys[row_id]
+                pos = int(key_hashes[row_id]) & mask
+                while slots[pos] != -1 and not (
+                    key_hashes[slots[pos]] == key_hashes[row_id] and keys[slots[pos]] == key
+                ):
+                    pos = (pos + 1) & mask
+                if slots[pos] == -1:
+                    slots[pos] = row_id
+                else:
+                    # Title already known: link the new rows after its last one
+                    tail = slots[pos]
+                    while next_ids[tail] != -1:
+                        tail = next_ids[tail]
+                    next_ids[tail] = row_id
+
+        # Merge the postings: each n-gram's new ids go after its old ones
+        grams = np.union1d(self.grams, other.grams)
+        old_pos = np.searchsorted(grams, self.grams)
+        new_pos = np.searchsorted(grams, other.grams)
+        old_lengths = np.zeros(len(grams), dtype=np.int64)
+        old_lengths[old_pos] = np.diff(self.gram_offsets)
+        lengths = old_lengths.copy()
+        lengths[new_pos] += np.diff(other.gram_offsets)
+        gram_offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+
+        gram_ids = np.empty(gram_offsets[-1], dtype=np.int32)
+        gram_ids[
+            np.repeat(gram_offsets[old_pos] - self.gram_offsets[:-1], np.diff(self.gram_offsets))
+            + np.arange(len(self.gram_ids))
+        ] = self.gram_ids
+        gram_ids[
+            np.repeat(
+                gram_offsets[new_pos] + old_lengths[new_pos] - other.gram_offsets[:-1],
+                np.diff(other.gram_offsets)
+            )
+            + np.arange(len(other.gram_ids))
+        ] = other.gram_ids + n_old
+
+        return TitleIndex(
+            keys, key_hashes, slots, next_ids, grams, gram_offsets, gram_ids, self.ngram_size
+        )
+
+    def take(self, ids):
+        """
+        New index with the rows ids, given in ascending order, renumbered from 0
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        new_id = np.full(len(self), -1, dtype=np.int64)
+        new_id[ids] = np.arange(len(ids))
+
+        # Renumbering keeps each n-gram's ids ascending; n-grams left empty are dropped
+        gram_ids = new_id[self.gram_ids]
+        kept = gram_ids >= 0
+        gram_of = np.repeat(np.arange(len(self.grams)), np.diff(self.gram_offsets))
+        lengths = np.bincount(gram_of[kept], minlength=len(self.grams))
+        used = lengths > 0
+
+        keys = self.keys.take(ids)
+        key_hashes = np.asarray(self.key_hashes)[ids]
+        return TitleIndex(
+            keys,
+            key_hashes,
+            *hash_table(keys.tolist(), key_hashes),
+            np.asarray(self.grams)[used],
+            np.concatenate(([0], np.cumsum(lengths[used]))).astype(np.int64),
+            gram_ids[kept].astype(np.int32),
+            self.ngram_size
+        )
+
+    def lookup(self, title):
+        """
+        Row ids of movies whose title matches exactly (after normalising)
+        """
+        key = normalize_title(title)
+        key_hash = title_hash(key)
+        mask = len(self.slots) - 1
+        pos = key_hash & mask
+        row_id = int(self.slots[pos])
+        while row_id >= 0:
+            if self.key_hashes[row_id] == key_hash and self.keys[row_id] == key:
+                matches = []
+                while row_id >= 0:
+                    matches.append(row_id)
+                    row_id = int(self.next_ids[row_id])
+                return matches
+            pos = (pos + 1) & mask
+            row_id = int(self.slots[pos])
+        return []
+
+    def postings(self, gram):
+        """
+        Ascending row ids of the titles containing an n-gram
+        """
+        i = int(np.searchsorted(self.grams, gram))
+        if i < len(self.grams) and self.grams[i] == gram:
+            return self.gram_ids[self.gram_offsets[i]:self.gram_offsets[i + 1]]
+        return self.gram_ids[:0]
+
+    def candidates(self, needle):
+        """
+        Ascending row ids of every title that may contain needle, a normalised string
+        """
+        n = self.ngram_size
+        if len(needle) < n:
+            # Every title containing a short needle has some n-gram containing it
+            hits = np.flatnonzero(np.char.find(np.asarray(self.grams), needle) >= 0)
+            if not len(hits):
+                return self.gram_ids[:0]
+            return np.unique(np.concatenate([
+                self.gram_ids[self.gram_offsets[i]:self.gram_offsets[i + 1]] for i in hits
+            ]))
+
+        # Every n-gram of the needle occurs in each title containing it
+        lists = sorted(
+            (self.postings(needle[i:i + n]) for i in range(len(needle) - n + 1)), key=len
+        )
+        candidates = np.asarray(lists[0])
+        for ids in lists[1:]:
+            if not len(candidates):
+                break
+            pos = np.minimum(np.searchsorted(ids, candidates), len(ids) - 1)
+            candidates = candidates[ids[pos] == candidates]
+        return candidates
+
+    def search(self, text, limit=None):
+        """
+        Row ids of movies whose title contains text, in catalog order
+        """
+        needle = normalize_title(text)
+        if not needle:
+            return []
+
+        matches = []
+        for row_id in self.candidates(needle).tolist():
+            if needle in self.keys[row_id]:
+                matches.append(row_id)
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def resolve(self, title):
+        """
+        Row id for a title: the first exact match, else the first substring match
+        """
+        matches = self.lookup(title) or self.search(title, limit=1)
+        return matches[0] if matches else None
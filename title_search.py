@@ -0,0 +1,206 @@
+from bisect import bisect_left, bisect_right
+from difflib import SequenceMatcher
+
+import numpy as np
+
+from movie_store import StringColumn
+from title_index import normalize_title, title_ngrams
+
+def ngram_similarity(query, title, n=3):
+    """
+    Dice coefficient of the two titles' character n-gram sets
+    """
+    query_grams = title_ngrams(query, n)
+    title_grams = title_ngrams(title, n)
+    return 2 * len(query_grams & title_grams) / (len(query_grams) + len(title_grams))
+
+def sequence_similarity(query, title):
+    """
+    difflib ratio of the two titles; slower, but stricter about order
+    """
+    return SequenceMatcher(None, query, title).ratio()
+
+class TitleSearchEngine:
+    """
+    Fuzzy and prefix title search for the search box
+
+    Fuzzy search counts shared character n-grams through the TitleIndex's
+    inverted index (n-gram -> row ids), keeps the best candidates and
+    re-ranks only those with scorer(query, title), any callable returning
+    a similarity in [0, 1]. Prefix completion bisects a sorted column of
+    every word-suffix of every title, so "knig" completes "The Dark Knight".
+    The completions are stored as arrays next to the TitleIndex, so a saved
+    engine is memory-mapped rather than rebuilt on load.
+    """
+    # n-grams in more than this fraction of titles are skipped when rarer
+    # ones exist; they add little to ranking and dominate the work
+    COMMON_NGRAM_FRACTION = 0.1
+    CANDIDATES_PER_RESULT = 5
+    # Stored arrays, see to_arrays()
+    ARRAYS = ('completion_offsets', 'completion_blob', 'completion_ids')
+
+    def __init__(self, titles, title_index, completion_keys, completion_ids, scorer=ngram_similarity):
+        self.titles = titles
+        self.index = title_index
+        self.keys = title_index.keys
+        self.completion_keys = completion_keys
+        self.completion_ids = completion_ids
+        self.scorer = scorer
+        self.ngram_size = title_index.ngram_size
+
+    @staticmethod
+    def completions(keys, first_id=0):
+        """
+        Sorted (word-suffix, row id) pairs of normalised titles as a
+        StringColumn and an int32 array
+        """
+        completions = []
+        for row_id, key in enumerate(keys, first_id):
+            words = key.split(' ')
+            for i in range(len(words)):
+                completions.append((' '.join(words[i:]), row_id))
+
+        completions.sort()
+        return (
+            StringColumn.from_strings([key for key, _ in completions]),
+            np.array([row_id for _, row_id in completions], dtype=np.int32)
+        )
+
+    @classmethod
+    def build(cls, titles, title_index, scorer=ngram_similarity):
+        return cls(titles, title_index, *cls.completions(title_index.keys.tolist()), scorer)
+
+    def to_arrays(self):
+        """
+        The completions as named arrays, for saving
+        """
+        return {
+            'completion_offsets': self.completion_keys.offsets,
+            'completion_blob': self.completion_keys.blob,
+            'completion_ids': self.completion_ids
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, titles, title_index, scorer=ngram_similarity):
+        return cls(
+            titles,
+            title_index,
+            StringColumn(arrays['completion_offsets'], arrays['completion_blob']),
+            arrays['completion_ids'],
+            scorer
+        )
+
+    def append(self, titles, title_index):
+        """
+        New engine over titles and title_index, whose rows past these are new
+        """
+        n_old = len(self)
+        new_keys, new_ids = self.completions(title_index.keys.tolist()[n_old:], n_old)
+
+        # New ids are larger, so each new completion goes after equal old keys
+        positions = [bisect_right(self.completion_keys, key) for key in new_keys.tolist()]
+        order = np.insert(
+            np.arange(len(self.completion_ids)), positions, np.arange(len(new_ids)) + len(self.completion_ids)
+        )
+        return TitleSearchEngine(
+            titles,
+            title_index,
+            self.completion_keys.append(new_keys).take(order),
+            np.concatenate((self.completion_ids, new_ids))[order].astype(np.int32),
+            self.scorer
+        )
+
+    def take(self, ids, titles, title_index):
+        """
+        New engine over titles and title_index, keeping the rows ids given in
+        ascending order
+        """
+        new_id = np.full(len(self), -1, dtype=np.int64)
+        new_id[np.asarray(ids, dtype=np.int64)] = np.arange(len(ids))
+        completion_ids = new_id[self.completion_ids]
+        kept = np.flatnonzero(completion_ids >= 0)
+        return TitleSearchEngine(
+            titles,
+            title_index,
+            self.completion_keys.take(kept),
+            completion_ids[kept].astype(np.int32),
+            self.scorer
+        )
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _candidates(self, query_key, count):
+        """
+        Row ids sharing the most n-grams with the query
+        """
+        lists = [
+            ids
+            for ids in map(self.index.postings, title_ngrams(query_key, self.ngram_size))
+            if len(ids)
+        ]
+        if not lists:
+            return np.empty(0, dtype=np.int32)
+
+        lists.sort(key=len)
+        common_limit = max(len(self.titles) * self.COMMON_NGRAM_FRACTION, 1)
+        rare = [ids for ids in lists if len(ids) <= common_limit]
+        if rare:
+            lists = rare
+
+        # Work is proportional to the postings touched, not the catalog size
+        matched, hits = np.unique(np.concatenate(lists), return_counts=True)
+        if len(matched) <= count:
+            return matched
+
+        top = np.argpartition(hits, len(matched) - count)[-count:]
+        return matched[top]
+
+    def search(self, query, limit=10, min_score=0.0):
+        """
+        Best fuzzy matches for query as (title, score, row_id), best first
+        """
+        query_key = normalize_title(query)
+        if not query_key:
+            return []
+
+        results = []
+        for row_id in self._candidates(query_key, limit * self.CANDIDATES_PER_RESULT).tolist():
+            score = self.scorer(query_key, self.keys[row_id])
+            if score >= min_score:
+                results.append((self.titles[row_id], score, row_id))
+
+        results.sort(key=lambda x: (-x[1], x[2]))
+        return results[:limit]
+
+    def complete(self, prefix, limit=10):
+        """
+        Titles with a word starting with prefix, as (title, row_id)
+        """
+        prefix_key = normalize_title(prefix)
+        if not prefix_key:
+            return []
+
+        results = []
+        seen = set()
+        pos = bisect_left(self.completion_keys, prefix_key)
+        while pos < len(self.completion_keys) and len(results) < limit:
+            if not self.completion_keys[pos].startswith(prefix_key):
+                break
+            row_id = int(self.completion_ids[pos])
+            if row_id not in seen:
+                seen.add(row_id)
+                results.append((self.titles[row_id], row_id))
+            pos += 1
+        return results
+
+    def suggest(self, text, limit=10):
+        """
+        Typeahead suggestions: prefix completions first, then fuzzy matches
+        """
+        suggestions = [title for title, _ in self.complete(text, limit)]
+        if len(suggestions) < limit:
+            for title, _, _ in self.search(text, limit):
+                if title not in suggestions:
+                    suggestions.append(title)
+        return suggestions[:limit]
@@ -0,0 +1,94 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from config import MODEL_DIR, TMDB_ENRICHMENT_BATCH, TMDB_ENRICHMENT_FILE, TMDB_FETCH_WORKERS
+from movie_store import MISSING_TMDB_ID, MovieStore
+from tmdb_integration import (
+    EnrichmentTable, TMDBIntegration, clean_year, enrichment_file_for, enrichment_key, find_trailer
+)
+
+def fetch_enrichment(tmdb, title, year=None, tmdb_id=None):
+    """
+    (tmdb_id, details, trailer_url) of a title from one search and one
+    details request, all None if TMDB has no match; request errors are raised
+    """
+    movie_data = tmdb.lookup_movie(title, year, tmdb_id)
+    if movie_data is None:
+        return None, None, None
+    return movie_data['id'], tmdb.summarize_movie(movie_data, title), find_trailer(movie_data)
+
+def enrich_catalog(movies, output_file=TMDB_ENRICHMENT_FILE, tmdb=None, workers=TMDB_FETCH_WORKERS,
+                   batch_size=TMDB_ENRICHMENT_BATCH):
+    """
+    Fetch TMDB metadata for every title of a MovieStore into the enrichment table
+
+    Titles are fetched by workers threads, batch_size at a time, and each
+    batch is committed before the next starts, so an interrupted run
+    resumes after the last batch. Titles already in the table are skipped;
+    titles whose requests failed are left out and retried by the next run.
+    Returns counts of enriched, not found and failed titles, or None if
+    the TMDB API is not configured.
+    """
+    if tmdb is None:
+        tmdb = TMDBIntegration(cache_file=None, max_workers=workers, enrichment_file=None)
+    if not tmdb.is_api_configured():
+        print("TMDB API not configured; skipping enrichment")
+        return None
+    
+    table = EnrichmentTable(output_file)
+    done = table.keys()
+    todo = {}
+    years = np.asarray(movies.year).tolist()
+    tmdb_ids = np.asarray(movies.tmdb_id).tolist()
+    for title, year, tmdb_id in zip(movies.titles(), years, tmdb_ids):
+        key = enrichment_key(title, year)
+        if key not in done and key not in todo:
+            todo[key] = (title, clean_year(year), None if tmdb_id == MISSING_TMDB_ID else tmdb_id)
+    print(f"{len(done)} titles already enriched, {len(todo)} to fetch")
+    
+    def fetch(movie):
+        title, year, tmdb_id = movie
+        try:
+            return (title, year) + fetch_enrichment(tmdb, title, year, tmdb_id)
+        except Exception as e:
+            print(f"Error enriching {title}: {str(e)}")
+            return None
+    
+    counts = {'enriched': 0, 'not_found': 0, 'failed': 0}
+    pending = list(todo.values())
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(pending), batch_size):
+            results = list(executor.map(fetch, pending[start:start + batch_size]))
+            rows = [row for row in results if row is not None]
+            table.write(rows)
+            
+            counts['failed'] += len(results) - len(rows)
+            found = sum(row[2] is not None for row in rows)
+            counts['enriched'] += found
+            counts['not_found'] += len(rows) - found
+            print(f"Enriched {start + len(results)}/{len(pending)} titles")
+    
+    return counts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch TMDB metadata for every catalog title into a local table")
+    parser.add_argument('--csv', default='sample_movies.csv', help="movie catalog CSV")
+    parser.add_argument('--model', default=MODEL_DIR, help="model the table is kept alongside")
+    parser.add_argument('--output', help="enrichment table to create or resume (default: the one alongside --model)")
+    parser.add_argument('--workers', type=int, default=TMDB_FETCH_WORKERS,
+                        help="concurrent TMDB requests")
+    parser.add_argument('--base-url', help="TMDB API base URL, e.g. a local stand-in server for testing")
+    args = parser.parse_args()
+    
+    tmdb = TMDBIntegration(cache_file=None, max_workers=args.workers, enrichment_file=None)
+    if args.base_url:
+        tmdb.base_url = args.base_url
+    
+    catalog = pd.read_csv(args.csv).dropna(subset=['title', 'overview'])
+    output_file = args.output or enrichment_file_for(args.model)
+    counts = enrich_catalog(MovieStore.from_frame(catalog), output_file, tmdb, args.workers)
+    if counts is not None:
+        print(f"Done: {counts['enriched']} enriched, {counts['not_found']} not found, {counts['failed']} failed")
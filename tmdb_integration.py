@@ -1,131 +1,525 @@
-import requests
-import os
-from config import TMDB_API_KEY, TMDB_BASE_URL, TMDB_IMAGE_BASE_URL
-
-class TMDBIntegration:
-    def __init__(self):
-        self.api_key = TMDB_API_KEY
-        self.base_url = TMDB_BASE_URL
-        self.image_base_url = TMDB_IMAGE_BASE_URL
-        
-    def search_movie(self, title, year=None):
-        """Search for a movie on TMDB"""
-        if self.api_key == 'your_api_key_here':
-            return None
-            
-        try:
-            search_url = f"{self.base_url}/search/movie"
-            params = {
-                'api_key': self.api_key,
-                'query': title,
-                'year': year
-            }
-            
-            response = requests.get(search_url, params=params)
-            data = response.json()
-            
-            if data['results']:
-                return data['results'][0]
-            return None
-            
-        except Exception as e:
-            print(f"Error searching movie: {str(e)}")
-            return None
-    
-    def get_movie_poster(self, title, year=None):
-        """Get movie poster URL"""
-        movie_data = self.search_movie(title, year)
-        if movie_data and movie_data.get('poster_path'):
-            return f"{self.image_base_url}{movie_data['poster_path']}"
-        return None
-    
-    def get_movie_details(self, title, year=None):
-        """Get detailed movie information"""
-        movie_data = self.search_movie(title, year)
-        if not movie_data:
-            return None
-            
-        try:
-            # Get additional details
-            movie_id = movie_data['id']
-            details_url = f"{self.base_url}/movie/{movie_id}"
-            params = {'api_key': self.api_key}
-            
-            response = requests.get(details_url, params=params)
-            details = response.json()
-            
-            return {
-                'title': details.get('title', title),
-                'overview': details.get('overview', ''),
-                'poster_url': f"{self.image_base_url}{details.get('poster_path', '')}" if details.get('poster_path') else None,
-                'backdrop_url': f"{self.image_base_url}{details.get('backdrop_path', '')}" if details.get('backdrop_path') else None,
-                'release_date': details.get('release_date', ''),
-                'runtime': details.get('runtime', 0),
-                'vote_average': details.get('vote_average', 0),
-                'vote_count': details.get('vote_count', 0),
-                'genres': [genre['name'] for genre in details.get('genres', [])],
-                'production_companies': [company['name'] for company in details.get('production_companies', [])],
-                'spoken_languages': [lang['name'] for lang in details.get('spoken_languages', [])]
-            }
-            
-        except Exception as e:
-            print(f"Error getting movie details: {str(e)}")
-            return None
-    
-    def get_movie_trailer(self, title, year=None):
-        """Get movie trailer URL"""
-        movie_data = self.search_movie(title, year)
-        if not movie_data:
-            return None
-            
-        try:
-            movie_id = movie_data['id']
-            videos_url = f"{self.base_url}/movie/{movie_id}/videos"
-            params = {'api_key': self.api_key}
-            
-            response = requests.get(videos_url, params=params)
-            videos = response.json()
-            
-            # Find trailer
-            for video in videos.get('results', []):
-                if video.get('type') == 'Trailer' and video.get('site') == 'YouTube':
-                    return f"https://www.youtube.com/watch?v={video['key']}"
-            
-            return None
-            
-        except Exception as e:
-            print(f"Error getting trailer: {str(e)}")
-            return None
-    
-    def get_trending_movies(self, limit=10):
-        """Get trending movies"""
-        if self.api_key == 'your_api_key_here':
-            return []
-            
-        try:
-            trending_url = f"{self.base_url}/trending/movie/week"
-            params = {'api_key': self.api_key}
-            
-            response = requests.get(trending_url, params=params)
-            data = response.json()
-            
-            trending_movies = []
-            for movie in data.get('results', [])[:limit]:
-                trending_movies.append({
-                    'title': movie.get('title', ''),
-                    'overview': movie.get('overview', ''),
-                    'poster_url': f"{self.image_base_url}{movie.get('poster_path', '')}" if movie.get('poster_path') else None,
-                    'vote_average': movie.get('vote_average', 0),
-                    'release_date': movie.get('release_date', ''),
-                    'id': movie.get('id', 0)
-                })
-            
-            return trending_movies
-            
-        except Exception as e:
-            print(f"Error getting trending movies: {str(e)}")
-            return []
-    
-    def is_api_configured(self):
-        """Check if TMDB API is properly configured"""
-        return self.api_key != 'your_api_key_here' and self.api_key is not None
+import requests
+import os
+import json
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from config import (
+    TMDB_API_KEY, TMDB_BACKOFF, TMDB_BASE_URL, TMDB_CACHE_FILE, TMDB_CACHE_TTLS,
+    TMDB_ENRICHMENT_FILE, TMDB_FETCH_WORKERS, TMDB_IMAGE_BASE_URL, TMDB_MAX_RETRIES, TMDB_MAX_RETRY_WAIT,
+    TMDB_NEGATIVE_TTL, TMDB_RATE_BURST, TMDB_RATE_LIMIT, TMDB_TIMEOUT
+)
+from title_index import normalize_title
+
+def clean_year(year):
+    """Year as an int, or None if it is missing or not a number"""
+    try:
+        year = int(year)
+    except (TypeError, ValueError):
+        return None
+    return year if year > 0 else None
+
+def enrichment_key(title, year=None):
+    """Key of a title in the enrichment table: normalised title and year"""
+    return f"{normalize_title(title)}|{clean_year(year) or ''}"
+
+def find_trailer(movie_data):
+    """YouTube URL of the first trailer in a /movie response with appended videos"""
+    for video in movie_data.get('videos', {}).get('results', []):
+        if video.get('type') == 'Trailer' and video.get('site') == 'YouTube':
+            return f"https://www.youtube.com/watch?v={video['key']}"
+    return None
+
+def retry_after_seconds(response):
+    """Seconds a 429/503 response asks us to wait, or None if it does not say"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Client-side rate limiter allowing rate requests per second in bursts of up to capacity"""
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take a token, sleeping until one is free"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the token even if it has to be waited for, so waiters queue in order
+            self.tokens -= 1
+            wait = max(-self.tokens / self.rate, self.blocked_until - now)
+        if wait > 0:
+            time.sleep(wait)
+    
+    def pause(self, seconds):
+        """Hold every caller back for seconds, e.g. after the server answered 429"""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+# TMDB limits requests per client IP, so every TMDBIntegration in the process shares one bucket
+rate_limiter = TokenBucket(TMDB_RATE_LIMIT, TMDB_RATE_BURST)
+
+class TMDBCache:
+    """Persistent TMDB response cache in SQLite, shared safely by several app processes"""
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+            )
+    
+    def _connect(self):
+        """One connection per thread; WAL mode lets readers work alongside a writer"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+    
+    def get(self, key):
+        """Return (hit, value); a cached "not found" is (True, None)"""
+        try:
+            row = self._connect().execute(
+                "SELECT value FROM responses WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading TMDB cache: {str(e)}")
+            return False, None
+        
+        if row is None:
+            return False, None
+        return True, json.loads(row[0])
+    
+    def set(self, key, value, ttl):
+        """Store a JSON-serialisable value for ttl seconds"""
+        try:
+            with self._connect() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time() + ttl)
+                )
+        except sqlite3.Error as e:
+            print(f"Error writing TMDB cache: {str(e)}")
+    
+    def purge(self):
+        """Delete expired entries"""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+
+def enrichment_file_for(model_file):
+    """Enrichment table kept alongside a model: the configured path, taken relative to the directory that holds model_file"""
+    return os.path.join(os.path.dirname(model_file), TMDB_ENRICHMENT_FILE)
+
+class EnrichmentTable:
+    """
+    TMDB metadata for catalog titles, fetched offline by tmdb_enrichment.py
+
+    One SQLite row per title and year holds its TMDB id, the dict
+    get_movie_details() returns and the trailer URL, all NULL if TMDB
+    has no match. Titles in the table are served without calling TMDB.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS movies ("
+                "key TEXT PRIMARY KEY, title TEXT, year INTEGER, tmdb_id INTEGER, "
+                "details TEXT, trailer_url TEXT, fetched_at REAL)"
+            )
+    
+    def _connect(self):
+        """One connection per thread, as for TMDBCache"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+    
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+    
+    def keys(self):
+        """Keys of every title already in the table"""
+        return {row[0] for row in self._connect().execute("SELECT key FROM movies")}
+    
+    def get(self, title, year=None):
+        """Dict of tmdb_id, details and trailer_url for a title, or None if it is not in the table"""
+        try:
+            row = self._connect().execute(
+                "SELECT tmdb_id, details, trailer_url FROM movies WHERE key = ?",
+                (enrichment_key(title, year),)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading TMDB enrichment: {str(e)}")
+            return None
+        
+        if row is None:
+            return None
+        return {
+            'tmdb_id': row[0],
+            'details': json.loads(row[1]) if row[1] else None,
+            'trailer_url': row[2]
+        }
+    
+    def write(self, rows):
+        """Store (title, year, tmdb_id, details, trailer_url) rows in one transaction"""
+        now = time.time()
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO movies VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (enrichment_key(title, year), title, clean_year(year), tmdb_id,
+                     json.dumps(details) if details else None, trailer_url, now)
+                    for title, year, tmdb_id, details, trailer_url in rows
+                ]
+            )
+
+class TMDBIntegration:
+    # fetch_many() field -> method taking (title, year, tmdb_id)
+    FETCHERS = {
+        'poster': 'get_movie_poster',
+        'details': 'get_movie_details',
+        'trailer': 'get_movie_trailer'
+    }
+    
+    def __init__(self, cache_file=TMDB_CACHE_FILE, max_workers=TMDB_FETCH_WORKERS,
+                 enrichment_file=TMDB_ENRICHMENT_FILE):
+        self.api_key = TMDB_API_KEY
+        self.base_url = TMDB_BASE_URL
+        self.image_base_url = TMDB_IMAGE_BASE_URL
+        self.cache = TMDBCache(cache_file) if cache_file else None
+        # Offline-fetched metadata, used instead of TMDB for the titles it has;
+        # opened by enrichment_table() once the file exists
+        self.enrichment_file = enrichment_file
+        self.enrichment = None
+        # (normalised title, year) -> TMDB id, filled in by search_movie
+        self.movie_ids = {}
+        # cache key -> Future of a request in progress, shared by every thread asking for it
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        # Threads start on first use and are kept, with their cache connections, between calls
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tmdb')
+        # Keep-alive connections, enough for every fetch_many worker
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.rate_limiter = rate_limiter
+    
+    def _get_json(self, path, **params):
+        """
+        GET a TMDB endpoint; returns None if TMDB answers 404 Not Found.
+        Server errors, 429 Too Many Requests and failed connections are
+        retried with jittered exponential backoff.
+        """
+        params['api_key'] = self.api_key
+        url = f"{self.base_url}{path}"
+        for attempt in range(TMDB_MAX_RETRIES + 1):
+            backoff = random.uniform(0, TMDB_BACKOFF * 2 ** attempt)
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, params=params, timeout=TMDB_TIMEOUT)
+            except requests.ConnectionError:
+                # Read timeouts are not retried, so a stalled TMDB costs one timeout per call
+                if attempt == TMDB_MAX_RETRIES:
+                    raise
+                time.sleep(backoff)
+                continue
+            
+            if (response.status_code == 429 or response.status_code >= 500) and attempt < TMDB_MAX_RETRIES:
+                wait = retry_after_seconds(response)
+                if wait is None:
+                    wait = backoff
+                elif response.status_code == 429:
+                    # Slow every caller down, but never block the app longer than one retry wait
+                    self.rate_limiter.pause(min(wait, TMDB_MAX_RETRY_WAIT))
+                if wait <= TMDB_MAX_RETRY_WAIT:
+                    time.sleep(wait + random.uniform(0, TMDB_BACKOFF))
+                    continue
+            
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json()
+    
+    def _cached(self, kind, key, fetch):
+        """Return fetch() through the cache, using the TTL for kind; errors are not cached"""
+        cache_key = f"{kind}:{key}"
+        if self.cache is not None:
+            hit, value = self.cache.get(cache_key)
+            if hit:
+                return value
+        
+        # Concurrent calls for the same key wait for one fetch instead of repeating it
+        with self._lock:
+            future = self._in_flight.get(cache_key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[cache_key] = Future()
+        if not owner:
+            return future.result()
+        
+        try:
+            value = fetch()
+            if self.cache is not None:
+                ttl = TMDB_CACHE_TTLS[kind] if value is not None else TMDB_NEGATIVE_TTL
+                self.cache.set(cache_key, value, ttl)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[cache_key]
+    
+    def _search(self, title, year=None):
+        """First TMDB search result for a title, or None; request errors are raised"""
+        year = clean_year(year)
+        
+        def fetch():
+            data = self._get_json('/search/movie', query=title, year=year)
+            if data and data['results']:
+                return data['results'][0]
+            return None
+        
+        movie_data = self._cached('search', f"{normalize_title(title)}|{year or ''}", fetch)
+        if movie_data:
+            self.movie_ids[(normalize_title(title), year)] = movie_data['id']
+        return movie_data
+    
+    def _movie(self, movie_id):
+        """TMDB details of an id with its videos, or None; request errors are raised"""
+        return self._cached(
+            'movie', movie_id,
+            lambda: self._get_json(f"/movie/{movie_id}", append_to_response='videos')
+        )
+    
+    def search_movie(self, title, year=None):
+        """Search for a movie on TMDB"""
+        if self.api_key == 'your_api_key_here':
+            return None
+        
+        try:
+            return self._search(title, year)
+        
+        except Exception as e:
+            print(f"Error searching movie: {str(e)}")
+            return None
+    
+    def resolve_id(self, title, year=None, tmdb_id=None):
+        """Get the TMDB id for a title, searching TMDB only the first time"""
+        if tmdb_id:
+            return tmdb_id
+        
+        # search_movie records every id it finds; "not found" is cached by it
+        movie_id = self.movie_ids.get((normalize_title(title), clean_year(year)))
+        if movie_id is None:
+            movie_data = self.search_movie(title, year)
+            movie_id = movie_data['id'] if movie_data else None
+        return movie_id
+    
+    def get_movie(self, movie_id):
+        """Get TMDB details for an id, with its videos, in one request"""
+        if self.api_key == 'your_api_key_here' or not movie_id:
+            return None
+        
+        try:
+            return self._movie(movie_id)
+        
+        except Exception as e:
+            print(f"Error getting movie: {str(e)}")
+            return None
+    
+    def lookup_movie(self, title, year=None, tmdb_id=None):
+        """Details with videos for a title, or None if TMDB has no match; unlike the getters, errors are raised"""
+        if not tmdb_id:
+            movie_data = self._search(title, year)
+            if not movie_data:
+                return None
+            tmdb_id = movie_data['id']
+        return self._movie(tmdb_id)
+    
+    def enrichment_table(self):
+        """The enrichment table, or None until its file exists, so a table written after startup is picked up"""
+        if self.enrichment is None and self.enrichment_file and os.path.exists(self.enrichment_file):
+            with self._lock:
+                if self.enrichment is None:
+                    self.enrichment = EnrichmentTable(self.enrichment_file)
+        return self.enrichment
+    
+    def enriched(self, title, year=None):
+        """Enrichment table entry for a title, or None if it has to come from TMDB"""
+        table = self.enrichment_table()
+        if table is None:
+            return None
+        return table.get(title, year)
+    
+    def get_movie_poster(self, title, year=None, tmdb_id=None):
+        """Get movie poster URL"""
+        enriched = self.enriched(title, year)
+        if enriched is not None:
+            return (enriched['details'] or {}).get('poster_url')
+        
+        if tmdb_id:
+            movie_data = self.get_movie(tmdb_id)
+        else:
+            # The search result carries the poster; no second request needed
+            movie_data = self.search_movie(title, year)
+        if movie_data and movie_data.get('poster_path'):
+            return f"{self.image_base_url}{movie_data['poster_path']}"
+        return None
+    
+    def get_movie_details(self, title, year=None, tmdb_id=None):
+        """Get detailed movie information"""
+        enriched = self.enriched(title, year)
+        if enriched is not None:
+            return enriched['details']
+        
+        details = self.get_movie(self.resolve_id(title, year, tmdb_id))
+        if not details:
+            return None
+        
+        try:
+            return self.summarize_movie(details, title)
+        
+        except Exception as e:
+            print(f"Error getting movie details: {str(e)}")
+            return None
+    
+    def summarize_movie(self, details, title=''):
+        """The fields of a TMDB /movie response that the app shows"""
+        return {
+            'title': details.get('title', title),
+            'overview': details.get('overview', ''),
+            'poster_url': f"{self.image_base_url}{details.get('poster_path', '')}" if details.get('poster_path') else None,
+            'backdrop_url': f"{self.image_base_url}{details.get('backdrop_path', '')}" if details.get('backdrop_path') else None,
+            'release_date': details.get('release_date', ''),
+            'runtime': details.get('runtime', 0),
+            'vote_average': details.get('vote_average', 0),
+            'vote_count': details.get('vote_count', 0),
+            'genres': [genre['name'] for genre in details.get('genres', [])],
+            'production_companies': [company['name'] for company in details.get('production_companies', [])],
+            'spoken_languages': [lang['name'] for lang in details.get('spoken_languages', [])]
+        }
+    
+    def get_movie_trailer(self, title, year=None, tmdb_id=None):
+        """Get movie trailer URL"""
+        enriched = self.enriched(title, year)
+        if enriched is not None:
+            return enriched['trailer_url']
+        
+        movie_data = self.get_movie(self.resolve_id(title, year, tmdb_id))
+        if not movie_data:
+            return None
+        
+        try:
+            return find_trailer(movie_data)
+        
+        except Exception as e:
+            print(f"Error getting trailer: {str(e)}")
+            return None
+    
+    def fetch_many(self, movies, fields=('poster', 'trailer')):
+        """
+        Fetch fields ('poster', 'details', 'trailer') for many movies concurrently
+        
+        movies are titles or dicts with title and optional year and tmdb_id.
+        Yields (index, field, value) for each movie and field as its request
+        completes; a value is None where the getter would return None.
+        Repeated movies are fetched once.
+        """
+        pending = {}
+        try:
+            for index, movie in enumerate(movies):
+                if isinstance(movie, str):
+                    movie = {'title': movie}
+                title, year, tmdb_id = movie['title'], clean_year(movie.get('year')), movie.get('tmdb_id')
+                for field in fields:
+                    key = (field, tmdb_id) if tmdb_id else (field, normalize_title(title), year)
+                    if key not in pending:
+                        fetcher = getattr(self, self.FETCHERS[field])
+                        pending[key] = (self._executor.submit(fetcher, title, year, tmdb_id), field, [])
+                    pending[key][2].append(index)
+            
+            tasks = {future: (field, indices) for future, field, indices in pending.values()}
+            for future in as_completed(tasks):
+                field, indices = tasks[future]
+                value = future.result()
+                for index in indices:
+                    yield index, field, value
+        finally:
+            # Drop requests not yet started if the caller stops early
+            for future, _, _ in pending.values():
+                future.cancel()
+    
+    def get_trending_movies(self, limit=10):
+        """Get trending movies"""
+        if self.api_key == 'your_api_key_here':
+            return []
+        
+        try:
+            data = self._cached('trending', 'week', lambda: self._get_json('/trending/movie/week'))
+            
+            trending_movies = []
+            for movie in (data or {}).get('results', [])[:limit]:
+                trending_movies.append({
+                    'title': movie.get('title', ''),
+                    'overview': movie.get('overview', ''),
+                    'poster_url': f"{self.image_base_url}{movie.get('poster_path', '')}" if movie.get('poster_path') else None,
+                    'vote_average': movie.get('vote_average', 0),
+                    'release_date': movie.get('release_date', ''),
+                    'id': movie.get('id', 0)
+                })
+            
+            return trending_movies
+        
+        except Exception as e:
+            print(f"Error getting trending movies: {str(e)}")
+            return []
+    
+    def is_api_configured(self):
+        """Check if TMDB API is properly configured"""
+        return self.api_key != 'your_api_key_here' and self.api_key is not None
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_tmdb_client(enrichment_file=TMDB_ENRICHMENT_FILE):
+    """The process-wide TMDBIntegration, so every app session shares its threads, connections and memo"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = TMDBIntegration(enrichment_file=enrichment_file)
+        return _client